@@ -0,0 +1,1060 @@
+import json
+import os
+import pathlib
+import re
+import threading
+import mmap
+import sqlite3
+import zlib
+from collections.abc import MutableMapping
+from concurrent.futures import ThreadPoolExecutor
+from Storage import DumpJson, AtomicWrite, AppendLines, ReplaceFile, LockFile
+from Entries import Entry, DayOrdinal, OrdinalDate, FromStored, ToStored, EntryIndex, NextId, WithEntry, \
+    WithoutEntry, WithEntryMoved
+
+JOURNALS_PATH = pathlib.Path("./Journals")
+# Backend used for new journals, existing journals keep the format they were written in
+DEFAULT_BACKEND = os.environ.get("JOURNAL_BACKEND", "json")
+# Number of appended log records after which the log is folded back into the snapshot
+COMPACT_THRESHOLD = 200
+# Number of previous snapshots kept next to the journal as jrn_<name>.json.bak<n>
+JOURNAL_BACKUPS = 2
+# Format of the stored entries. 1: [markup, display time] pairs, 2: plain text with the minute of the day,
+# 3: entries carry an id that is unique within their day
+FORMAT_VERSION = 3
+# Characters that open or close a value of a stored journal, and the rest of a string up to its closing quote
+JSON_TOKEN = re.compile(rb'["\[\]{}]')
+JSON_STRING_END = re.compile(rb'[^"\\]*(?:\\.[^"\\]*)*"', re.DOTALL)
+
+# Writes and compactions of every journal run one at a time on this thread,
+# so they never block the caller and never race each other
+ioExecutor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="journal-io")
+
+
+class LazyDays(MutableMapping):
+    # Day ordinal -> entries mapping over a backend. Only the known dates are kept in memory and
+    # days are read from disk on access. Days changed in memory but not yet written
+    # (log replay, new entries) are held in 'changed'.
+    def __init__(self, known, reader):
+        self.known = known
+        self.reader = reader
+        self.changed = {}
+
+    def __getitem__(self, day):
+        if day in self.changed:
+            return self.changed[day]
+        if day not in self.known:
+            raise KeyError(day)
+        return self.reader(day)
+
+    def __setitem__(self, day, entries):
+        self.changed[day] = entries
+
+    def __delitem__(self, day):
+        raise NotImplementedError("Days can't be removed from a journal")
+
+    def __contains__(self, day):
+        return day in self.changed or day in self.known
+
+    def __iter__(self):
+        # Copies, as the I/O thread may add dates while the caller iterates
+        yield from list(self.known)
+        for day in list(self.changed):
+            if day not in self.known:
+                yield day
+
+    def __len__(self):
+        return len(self.known) + sum(1 for day in list(self.changed) if day not in self.known)
+
+
+class JsonBackend:
+    # Plain JSON snapshot (jrn_<name>.json) with a byte offset index (.idx) and an
+    # append-only log of changed days (.log) that is compacted into the snapshot.
+    # Several copies of the app may have the journal open: every write holds the advisory
+    # lock on jrn_<name>.lock and first reads what the others appended or compacted.
+    suffix = ".json"
+
+    def __init__(self, name):
+        self.name = name
+        self.path = JOURNALS_PATH / f"jrn_{name}.json"
+        self.logPath = JOURNALS_PATH / f"jrn_{name}.log"
+        self.indexPath = JOURNALS_PATH / f"jrn_{name}.idx"
+        self.lockPath = JOURNALS_PATH / f"jrn_{name}.lock"
+        self.days = None
+        self.offsets = {}
+        # CRC-32 of every day in the snapshot, to tell which days another process's compaction changed
+        self.crcs = {}
+        # (size, mtime) of the snapshot the offsets belong to
+        self.snapshotStat = None
+        self.logCount = 0
+        # Bytes of the log already applied to the days
+        self.logOffset = 0
+        self.lock = threading.Lock()
+        # (day, operation, added entry or None) of the records waiting to be appended
+        self.pendingRecords = []
+        # Added entries of pendingRecords whose id a record of another process took meanwhile, see FreeId
+        self.takenAdds = set()
+        # (day, entry id) of the entries the last snapshot of this process wrote while records were pending,
+        # the pending adds among them are this process's own entries
+        self.storedIds = set()
+        self.compactScheduled = False
+        # Days changed by other processes and not yet reported by Refresh, day -> previous entries
+        self.external = {}
+
+    @staticmethod
+    def Files(name):
+        path = JOURNALS_PATH / f"jrn_{name}.json"
+        return [path, path.with_suffix(".log"), path.with_suffix(".idx"), path.with_suffix(".lock"),
+                *JOURNALS_PATH.glob(f"{path.name}.bak*")]
+
+    @staticmethod
+    def ReadAll(name):
+        # Every day of the journal without writing anything, for readers other than the open journal
+        path = JOURNALS_PATH / f"jrn_{name}.json"
+        with open(path) as f:
+            days = {DayOrdinal(date): FromStored(entries) for date, entries in json.load(f).items()}
+        for record in ReadRecords(path.with_suffix(".log")):
+            day = DayOrdinal(record["date"])
+            days[day] = ApplyRecord(days.get(day, ()), record)
+        return days
+
+    class Reader:
+        # Read-only access to the days of a journal, for readers other than the open journal. The dates
+        # come from the index and the log, days are read from the snapshot as they are needed.
+        # Journals without a current index are scanned for the offsets of their days. Nothing is written.
+        def __init__(self, name):
+            self.name = name
+            self.Load()
+
+        def Load(self):
+            backend = JsonBackend(self.name)
+            self.path = backend.path
+            index = backend.LoadIndex()
+            if index is None:
+                with open(self.path, 'rb') as f:
+                    stat = os.fstat(f.fileno())
+                    self.offsets = {DayOrdinal(date): (offset, length) for date, offset, length in ScanDays(f)}
+                self.snapshotStat = (stat.st_size, stat.st_mtime_ns)
+            else:
+                self.offsets, _, self.snapshotStat = index
+            # Days with log records are few, they are replayed over the snapshot right away
+            records = {}
+            for record in ReadRecords(backend.logPath):
+                records.setdefault(DayOrdinal(record["date"]), []).append(record)
+            self.days = {}
+            for day, dayRecords in records.items():
+                entries = self.ReadStored(day)
+                for record in dayRecords:
+                    entries = ApplyRecord(entries, record)
+                self.days[day] = entries
+            # Days stored without entries ("[]") aren't listed
+            self.dates = sorted([day for day, (_, length) in self.offsets.items() if length > 2 and day not in self.days]
+                                + [day for day, entries in self.days.items() if entries])
+
+        def ReadStored(self, day):
+            if day not in self.offsets:
+                return ()
+            offset, length = self.offsets[day]
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                return FromStored(json.loads(f.read(length)))
+
+        def ReadDay(self, day):
+            if day in self.days:
+                return self.days[day]
+            stat = self.path.stat()
+            if (stat.st_size, stat.st_mtime_ns) != self.snapshotStat:
+                # The journal was compacted since its index was read
+                self.Load()
+                return self.ReadDay(day)
+            return self.ReadStored(day)
+
+    def Create(self):
+        if not JOURNALS_PATH.exists():
+            JOURNALS_PATH.mkdir()
+        with LockFile(self.lockPath):
+            if not self.path.exists():
+                self.WriteSnapshot({}, self.path)
+
+    def Load(self):
+        with LockFile(self.lockPath):
+            self.LoadSnapshot()
+            self.days = LazyDays(self.offsets, self.ReadDay)
+            self.ReplayLog()
+        if self.logCount >= COMPACT_THRESHOLD:
+            self.ScheduleCompaction()
+
+    def LoadSnapshot(self):
+        # Offsets of the current snapshot, called with the file lock held
+        index = self.LoadIndex()
+        if index is None:
+            # One-time migration of a journal written without a date index or in an older format,
+            # the previous snapshot is kept as a backup
+            with open(self.path) as f:
+                days = {DayOrdinal(date): json.dumps(ToStored(FromStored(entries))).encode()
+                        for date, entries in json.load(f).items()}
+            self.WriteSnapshot(days, self.path, JOURNAL_BACKUPS)
+            return
+        with self.lock:
+            self.offsets, self.crcs, self.snapshotStat = index
+            if self.days is not None:
+                self.days.known = self.offsets
+
+    def ReadDay(self, day):
+        return self.ReadDays((day,))[0]
+
+    def ReadDays(self, days):
+        # Entries of several days with the snapshot mapped once. Days changed in memory take precedence,
+        # the lock keeps a compaction from moving them to the snapshot halfway through.
+        while True:
+            with self.lock:
+                batch = self.ReadCurrent(days)
+            if batch is not None:
+                return batch
+            # Another process compacted the journal, the offsets are those of the snapshot it replaced
+            with LockFile(self.lockPath):
+                self.CatchUp()
+
+    def ReadCurrent(self, days):
+        # ReadDays with self.lock held, days not in the journal read as empty.
+        # -> None if the snapshot was replaced since its offsets were loaded
+        if all(day in self.days.changed or day not in self.offsets for day in days):
+            return [self.days.changed.get(day, ()) for day in days]
+        with open(self.path, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            if (stat.st_size, stat.st_mtime_ns) != self.snapshotStat:
+                return None
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                batch = []
+                for day in days:
+                    if day in self.days.changed:
+                        batch.append(self.days.changed[day])
+                    elif day in self.offsets:
+                        offset, length = self.offsets[day]
+                        batch.append(FromStored(json.loads(m[offset:offset + length])))
+                    else:
+                        batch.append(())
+                return batch
+
+    def ChangeDay(self, day, change):
+        # Replace the entries of the day in memory by change(entries). The day is read and written under
+        # the lock, so a change made on another thread in between isn't overwritten. -> the entries before
+        while True:
+            with self.lock:
+                batch = self.ReadCurrent((day,))
+                if batch is not None:
+                    entries = change(batch[0])
+                    if entries is not batch[0]:
+                        self.days.changed[day] = entries
+                    return batch[0]
+            with LockFile(self.lockPath):
+                self.CatchUp()
+
+    def LoadIndex(self):
+        # The index is only trusted if it was written for the current snapshot.
+        # -> (offsets, crcs, (size, mtime) of the snapshot)
+        try:
+            with open(self.indexPath) as f:
+                index = json.load(f)
+            stat = self.path.stat()
+        except (OSError, json.JSONDecodeError):
+            return None
+        if index.get("size") != stat.st_size or index.get("mtime") != stat.st_mtime_ns or \
+                index.get("version") != FORMAT_VERSION or "crcs" not in index:
+            return None
+        offsets = {DayOrdinal(date): tuple(offset) for date, offset in index["days"].items()}
+        # The checksums are listed in the order of the days
+        crcs = dict(zip(offsets, index["crcs"]))
+        # Days stored without entries ("[]") by earlier versions aren't part of the journal
+        offsets = {day: offset for day, offset in offsets.items() if offset[1] > 2}
+        return offsets, {day: crcs[day] for day in offsets}, (stat.st_size, stat.st_mtime_ns)
+
+    def WriteSnapshot(self, days, path, backups=0):
+        # Write the days (day ordinal -> JSON encoded entries) as a plain JSON object plus a sidecar
+        # index of each day's byte offset, so single days can be read without parsing the file.
+        # Days without entries are left out.
+        parts = [b"{"]
+        position = 1
+        offsets = {}
+        crcs = {}
+        for i, day in enumerate(sorted(day for day in days if days[day] != b"[]")):
+            key = json.dumps(OrdinalDate(day)).encode() + b": "
+            if i > 0:
+                parts.append(b", ")
+                position += 2
+            parts.append(key)
+            position += len(key)
+            offsets[day] = (position, len(days[day]))
+            crcs[day] = zlib.crc32(days[day])
+            parts.append(days[day])
+            position += len(days[day])
+        parts.append(b"}")
+        newPath = path.with_name(path.name + ".new")
+        AtomicWrite(newPath, b"".join(parts))
+        stat = newPath.stat()
+        newIndexPath = self.indexPath.with_name(self.indexPath.name + ".new")
+        DumpJson({"version": FORMAT_VERSION, "size": position + 1, "mtime": stat.st_mtime_ns,
+                  "days": {OrdinalDate(day): offset for day, offset in offsets.items()},
+                  "crcs": list(crcs.values())}, newIndexPath)
+        with self.lock:
+            ReplaceFile(newPath, path, backups)
+            ReplaceFile(newIndexPath, self.indexPath)
+            self.offsets = offsets
+            self.crcs = crcs
+            self.snapshotStat = (stat.st_size, stat.st_mtime_ns)
+            if self.days is not None:
+                self.days.known = offsets
+        return offsets
+
+    def ReplayLog(self):
+        # Log records can be replayed over a snapshot that already contains them, see ApplyRecord
+        self.logCount = 0
+        self.logOffset = 0
+        self.ReadLog()
+        if self.logPath.exists() and self.logPath.stat().st_size > self.logOffset:
+            # A torn record from an interrupted append, everything before it is intact. It is cut off
+            # so the next records are appended on a line of their own.
+            with open(self.logPath, 'r+b') as f:
+                f.truncate(self.logOffset)
+
+    def ReadLog(self):
+        # Apply the complete records past logOffset, called with the file lock held.
+        # -> day -> entries before the records, of the days they changed
+        changed = {}
+        try:
+            if self.logPath.stat().st_size <= self.logOffset:
+                return changed
+            with open(self.logPath, 'rb') as f:
+                f.seek(self.logOffset)
+                data = f.read()
+        except FileNotFoundError:
+            return changed
+        for line in data.split(b"\n")[:-1]:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                break
+            day = DayOrdinal(record["date"])
+            if "put" in record:
+                self.TakeId(day, record["put"]["id"])
+            changed.setdefault(day, self.ChangeDay(day, lambda entries: ApplyRecord(entries, record)))
+            self.logCount += 1
+            self.logOffset += len(line) + 1
+        return changed
+
+    def CatchUp(self):
+        # Apply what other processes wrote since the journal was last read, called with the file lock held.
+        # The changed days are kept for Refresh.
+        stat = self.path.stat()
+        changed = {}
+        if (stat.st_size, stat.st_mtime_ns) != self.snapshotStat:
+            changed = self.ReloadSnapshot()
+        for day, entries in self.ReadLog().items():
+            changed.setdefault(day, entries)
+        with self.lock:
+            for day, entries in changed.items():
+                self.external.setdefault(day, entries)
+
+    def ReloadSnapshot(self):
+        # Another process compacted the journal: it read the whole log before folding it into the new
+        # snapshot and truncating it. Only the days whose checksum changed are read and compared.
+        # -> day -> entries before the compaction, None for days whose entries were only in the old snapshot
+        oldCrcs = self.crcs
+        changed = dict(self.days.changed)
+        self.LoadSnapshot()
+        with self.lock:
+            # Days folded into the snapshot are read from it again, days with records still waiting to be
+            # appended are rebuilt over it
+            for day, entries in changed.items():
+                if day in self.offsets and self.days.changed.get(day) is entries:
+                    del self.days.changed[day]
+            # Days emptied by the other process are left out of its snapshot, they stay without entries
+            for day in oldCrcs:
+                if day not in self.offsets and day not in self.days.changed:
+                    self.days.changed[day] = ()
+            pending = list(self.pendingRecords)
+        self.RebuildPending(pending)
+        self.logOffset = 0
+        candidates = sorted(set(changed) | {day for day, crc in self.crcs.items() if oldCrcs.get(day) != crc}
+                            | {day for day in oldCrcs if day not in self.crcs})
+        result = {}
+        for day, entries in zip(candidates, self.ReadDays(candidates)):
+            if day in changed:
+                if ToStored(entries) != ToStored(changed[day]):
+                    result[day] = changed[day]
+            else:
+                result[day] = None if day in oldCrcs else ()
+        return result
+
+    def RebuildPending(self, pending):
+        # Apply the records waiting to be appended over a new snapshot. An added entry whose id is in the
+        # snapshot already was taken by another process, it gets a free id when it is appended (see FreeId)
+        # and the operations on it wait until then as well.
+        takenIds = set()
+        for day, operation, addedEntry in pending:
+            if addedEntry is None:
+                if (day, RecordEntryId(operation)) not in takenIds:
+                    self.ChangeDay(day, lambda entries: ApplyRecord(entries, operation))
+                continue
+            with self.lock:
+                isTaken = addedEntry in self.takenAdds
+                # Written by a snapshot of this process, the id in the new snapshot is the entry itself
+                isStored = (day, addedEntry.id) in self.storedIds
+            if not isTaken:
+                entries = self.ChangeDay(day, lambda entries: entries if not isStored and
+                                         EntryIndex(entries, addedEntry.id) is not None else
+                                         ApplyRecord(entries, operation))
+                isTaken = not isStored and EntryIndex(entries, addedEntry.id) is not None
+                if isTaken:
+                    self.TakeId(day, addedEntry.id)
+            if isTaken:
+                takenIds.add((day, addedEntry.id))
+
+    def TakeId(self, day, entryId):
+        # A record of another process put an entry with this id, an add of ours still waiting for it lost it.
+        # Adds a snapshot of ours wrote already are on disk, the record changes that entry.
+        with self.lock:
+            if (day, entryId) in self.storedIds:
+                return
+            for pendingDay, _, addedEntry in self.pendingRecords:
+                if addedEntry is not None and pendingDay == day and addedEntry.id == entryId:
+                    self.takenAdds.add(addedEntry)
+
+    def Refresh(self):
+        # Days other processes changed since the last refresh -> their entries before the change,
+        # None where those aren't known anymore
+        with LockFile(self.lockPath):
+            self.CatchUp()
+        with self.lock:
+            changed, self.external = self.external, {}
+        return changed
+
+    def AppendEntry(self, day, entry):
+        added = []
+
+        def Add(entries):
+            # A record of another process applied since the id was picked may have taken it
+            added.append(entry if EntryIndex(entries, entry.id) is None else
+                         Entry(NextId(entries), entry.text, entry.minute, entry.edited))
+            return WithEntry(entries, added[0])
+        self.ChangeDay(day, Add)
+        self.AppendLog(day, {"put": ToStored(added)[0]}, added[0])
+
+    def UpdateEntry(self, day, entry):
+        self.ChangeDay(day, lambda entries: WithEntry(entries, entry))
+        self.AppendLog(day, {"put": ToStored((entry,))[0]})
+
+    def DeleteEntry(self, day, entryId):
+        self.ChangeDay(day, lambda entries: WithoutEntry(entries, entryId))
+        self.AppendLog(day, {"delete": entryId})
+
+    def MoveEntry(self, day, entryId, position):
+        self.ChangeDay(day, lambda entries: WithEntryMoved(entries, entryId, position))
+        self.AppendLog(day, {"move": entryId, "position": position})
+
+    def AppendLog(self, day, operation, addedEntry=None):
+        # Only the changed entry is logged, the whole day is written when the log is compacted
+        with self.lock:
+            self.pendingRecords.append((day, operation, addedEntry))
+            # Records queued while a flush is waiting are written by that same flush
+            if len(self.pendingRecords) == 1:
+                ioExecutor.submit(self.FlushLog)
+
+    def FlushLog(self):
+        with LockFile(self.lockPath):
+            # Records other processes appended are applied first, the log is then read past them and ours
+            self.CatchUp()
+            with self.lock:
+                pending, self.pendingRecords = self.pendingRecords, []
+                takenAdds, self.takenAdds = self.takenAdds, set()
+                self.storedIds = set()
+            records = []
+            # (day, entry id) -> new id of the added entries that got a free id
+            newIds = {}
+            for day, operation, addedEntry in pending:
+                if addedEntry in takenAdds:
+                    operation = self.FreeId(day, addedEntry, newIds)
+                elif addedEntry is None:
+                    if (day, RecordEntryId(operation)) in newIds:
+                        operation = RetargetRecord(operation, newIds[(day, RecordEntryId(operation))])
+                    self.Reapply(day, operation)
+                records.append(json.dumps({"date": OrdinalDate(day), **operation}))
+            if records:
+                AppendLines(self.logPath, records)
+                self.logCount += len(records)
+                self.logOffset = self.logPath.stat().st_size
+        if self.logCount >= COMPACT_THRESHOLD:
+            self.ScheduleCompaction()
+
+    def Reapply(self, day, operation):
+        # Records of other processes read since the operation was made went over it in memory,
+        # in the log it comes after them
+        entries = self.ChangeDay(day, lambda entries: ApplyRecord(entries, operation))
+        if ToStored(entries) != ToStored(self.days[day]):
+            with self.lock:
+                self.external.setdefault(day, entries)
+
+    def FreeId(self, day, entry, newIds):
+        # Another process added an entry with the same id after this one was added. Its record came first
+        # and replaced this entry, which is added again with the next free id. The later operations
+        # on the entry follow it to its new id.
+        added = []
+
+        def AddAgain(entries):
+            added.append(Entry(NextId(entries), entry.text, entry.minute, entry.edited))
+            return WithEntry(entries, added[0])
+        entries = self.ChangeDay(day, AddAgain)
+        newIds[(day, entry.id)] = added[0].id
+        with self.lock:
+            self.external.setdefault(day, entries)
+        return {"put": ToStored(added)[0]}
+
+    def Flush(self):
+        # Block until every queued write has reached the disk
+        ioExecutor.submit(lambda: None).result()
+
+    def Close(self):
+        self.Flush()
+
+    def Save(self):
+        # Fold the log into a fresh snapshot. Unchanged days are copied as raw bytes.
+        # The log may hold records of other processes, they are applied before it is folded.
+        with LockFile(self.lockPath):
+            self.CatchUp()
+            with self.lock:
+                changed = dict(self.days.changed)
+                offsets = self.offsets
+                logSize = self.logPath.stat().st_size if self.logPath.exists() else 0
+                logCount = self.logCount
+                data = self.path.read_bytes()
+            days = {day: data[offset:offset + length] for day, (offset, length) in offsets.items()}
+            days.update({day: json.dumps(ToStored(entries)).encode() for day, entries in changed.items()})
+            self.WriteSnapshot(days, self.path, JOURNAL_BACKUPS)
+            with self.lock:
+                if self.pendingRecords:
+                    self.storedIds.update((day, entry.id) for day, entries in changed.items() for entry in entries)
+                # Days changed again while the snapshot was written stay in memory, as do days
+                # without entries since the snapshot leaves them out
+                for day, entries in changed.items():
+                    if entries and self.days.changed.get(day) is entries:
+                        del self.days.changed[day]
+                # Keep the records appended while the snapshot was being written
+                tail = b""
+                if self.logPath.exists():
+                    with open(self.logPath, 'rb') as f:
+                        f.seek(logSize)
+                        tail = f.read()
+                    AtomicWrite(self.logPath, tail)
+                self.logCount -= logCount
+                self.logOffset = len(tail)
+
+    def ScheduleCompaction(self):
+        with self.lock:
+            if self.compactScheduled:
+                return
+            self.compactScheduled = True
+        ioExecutor.submit(self.Compact)
+
+    def Compact(self):
+        with self.lock:
+            self.compactScheduled = False
+        self.Save()
+
+    def WriteDays(self, days):
+        # Replace the whole journal, used when converting from another backend
+        with LockFile(self.lockPath):
+            self.WriteSnapshot({day: json.dumps(ToStored(entries)).encode() for day, entries in days.items()},
+                               self.path, JOURNAL_BACKUPS)
+            self.logPath.unlink(missing_ok=True)
+
+
+class SqliteBackend:
+    # One SQLite database per journal (jrn_<name>.db) with journals, days and entries tables.
+    # Days are looked up through the (journal_id, date) index and entries by (day_id, position).
+    # SQLite locks the database for every write itself. Each write bumps the revision of its day,
+    # so the days other connections changed can be found without reading them.
+    suffix = ".db"
+    schema = """
+    CREATE TABLE IF NOT EXISTS journals (
+        id INTEGER PRIMARY KEY,
+        name TEXT NOT NULL UNIQUE
+    );
+    CREATE TABLE IF NOT EXISTS days (
+        id INTEGER PRIMARY KEY,
+        journal_id INTEGER NOT NULL REFERENCES journals(id),
+        date TEXT NOT NULL,
+        revision INTEGER NOT NULL DEFAULT 0,
+        UNIQUE (journal_id, date)
+    );
+    CREATE TABLE IF NOT EXISTS entries (
+        id INTEGER PRIMARY KEY,
+        day_id INTEGER NOT NULL REFERENCES days(id),
+        position INTEGER NOT NULL,
+        entry_id INTEGER NOT NULL DEFAULT 0,
+        text TEXT NOT NULL,
+        minute INTEGER NOT NULL,
+        edited INTEGER NOT NULL DEFAULT 0
+    );
+    CREATE INDEX IF NOT EXISTS entries_day ON entries (day_id, position);
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.path = JOURNALS_PATH / f"jrn_{name}.db"
+        self.days = None
+        self.connection = None
+        self.journalId = None
+        # Day -> revision of the day as last written or read by this connection
+        self.revisions = {}
+        self.dataVersion = None
+        # Day -> number of its writes queued on the I/O thread
+        self.queued = {}
+        # (day, entry id) -> id of the added entries that got a free id, while writes of their day are queued
+        self.newIds = {}
+        # Days other connections changed that a write of ours found first, for Refresh
+        self.external = {}
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def Files(name):
+        path = JOURNALS_PATH / f"jrn_{name}.db"
+        return [path, path.with_name(path.name + "-wal"), path.with_name(path.name + "-shm")]
+
+    @staticmethod
+    def ReadAll(name):
+        # Every day of the journal without writing anything, for readers other than the open journal
+        path = JOURNALS_PATH / f"jrn_{name}.db"
+        connection = sqlite3.connect(f"{path.resolve().as_uri()}?mode=ro", uri=True)
+        try:
+            days = {}
+            columns = {row[1] for row in connection.execute("PRAGMA table_info(entries)")}
+            # Databases not opened since the format changed are converted as they are read
+            if "entry" in columns:
+                rows = connection.execute(
+                    "SELECT days.date, entries.entry, entries.time FROM days "
+                    "LEFT JOIN entries ON entries.day_id = days.id ORDER BY days.date, entries.position")
+            else:
+                idColumn = "entries.entry_id" if "entry_id" in columns else "entries.position"
+                rows = connection.execute(
+                    f"SELECT days.date, {idColumn}, entries.text, entries.minute, entries.edited FROM days "
+                    "LEFT JOIN entries ON entries.day_id = days.id ORDER BY days.date, entries.position")
+            for date, *entry in rows:
+                entries = days.setdefault(date, [])
+                if entry[-1] is not None:
+                    entries.append(entry)
+            if "entry" in columns:
+                return {DayOrdinal(date): FromStored(entries) for date, entries in days.items()}
+            return {DayOrdinal(date): FromRows(entries) for date, entries in days.items()}
+        finally:
+            connection.close()
+
+    class Reader:
+        # Read-only access to the days of a journal, for readers other than the open journal. The dates
+        # are read from the days table and each day with a query of its own, over a connection that is
+        # only open for that query. Databases in an older format are read whole. Nothing is written.
+        def __init__(self, name):
+            self.path = JOURNALS_PATH / f"jrn_{name}.db"
+            self.days = None
+            connection = self.Connect()
+            try:
+                columns = {row[1] for row in connection.execute("PRAGMA table_info(entries)")}
+                if "entry_id" not in columns:
+                    self.days = SqliteBackend.ReadAll(name)
+                    self.dates = sorted(day for day, entries in self.days.items() if entries)
+                else:
+                    rows = connection.execute("SELECT DISTINCT days.date FROM days "
+                                              "JOIN entries ON entries.day_id = days.id")
+                    self.dates = sorted(DayOrdinal(date) for date, in rows)
+            finally:
+                connection.close()
+
+        def Connect(self):
+            return sqlite3.connect(f"{self.path.resolve().as_uri()}?mode=ro", uri=True)
+
+        def ReadDay(self, day):
+            if self.days is not None:
+                return self.days.get(day, ())
+            connection = self.Connect()
+            try:
+                return FromRows(connection.execute(
+                    "SELECT entries.entry_id, entries.text, entries.minute, entries.edited FROM entries "
+                    "JOIN days ON entries.day_id = days.id WHERE days.date = ? ORDER BY entries.position",
+                    (OrdinalDate(day),)).fetchall())
+            finally:
+                connection.close()
+
+    def Create(self):
+        if not JOURNALS_PATH.exists():
+            JOURNALS_PATH.mkdir()
+        # The connection is shared by the GUI and I/O threads, every use holds self.lock
+        self.connection = sqlite3.connect(self.path, check_same_thread=False)
+        with self.lock, self.connection:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            version = self.Migrate()
+            self.connection.executescript(self.schema)
+            self.MigrateRows(version)
+            self.connection.execute("INSERT OR IGNORE INTO journals (name) VALUES (?)", (self.name,))
+            self.journalId = self.connection.execute("SELECT id FROM journals WHERE name = ?",
+                                                     (self.name,)).fetchone()[0]
+
+    def Migrate(self):
+        # Entries of the first format are moved aside, the new table is created by the schema.
+        # Entries of the second format get their id column, filled in by MigrateRows.
+        version = self.connection.execute("PRAGMA user_version").fetchone()[0]
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(entries)")}
+        if "entry" in columns:
+            self.connection.execute("ALTER TABLE entries RENAME TO entries_legacy")
+            self.connection.execute("DROP INDEX IF EXISTS entries_day")
+        elif columns and "entry_id" not in columns:
+            self.connection.execute("ALTER TABLE entries ADD COLUMN entry_id INTEGER NOT NULL DEFAULT 0")
+        dayColumns = {row[1] for row in self.connection.execute("PRAGMA table_info(days)")}
+        if dayColumns and "revision" not in dayColumns:
+            self.connection.execute("ALTER TABLE days ADD COLUMN revision INTEGER NOT NULL DEFAULT 0")
+        return version
+
+    def MigrateRows(self, version):
+        # The copied rows and the new user_version commit together, an interrupted
+        # migration is picked up again on the next start
+        if self.connection.execute("SELECT name FROM sqlite_master WHERE name = 'entries_legacy'").fetchone():
+            rows = self.connection.execute("SELECT day_id, position, entry, time FROM entries_legacy").fetchall()
+            self.connection.executemany(
+                "INSERT INTO entries (day_id, position, entry_id, text, minute, edited) VALUES (?, ?, ?, ?, ?, ?)",
+                [(dayId, position, position, entry.text, entry.minute, entry.edited)
+                 for (dayId, position, *_), entry in zip(rows, FromStored([row[2:] for row in rows]))])
+            self.connection.execute("DROP TABLE entries_legacy")
+        elif version < FORMAT_VERSION:
+            self.connection.execute("UPDATE entries SET entry_id = position")
+        self.connection.execute(f"PRAGMA user_version = {FORMAT_VERSION}")
+
+    def Load(self):
+        with self.lock:
+            self.dataVersion = self.connection.execute("PRAGMA data_version").fetchone()[0]
+            rows = self.connection.execute("SELECT date, revision FROM days WHERE journal_id = ?", (self.journalId,))
+            self.revisions = {DayOrdinal(date): revision for date, revision in rows}
+        self.days = LazyDays(set(self.revisions), self.ReadDay)
+
+    def ReadDay(self, day):
+        with self.lock:
+            return self.ReadStored(day)
+
+    def ReadStored(self, day):
+        # Entries of the day in the database, called with self.lock held
+        rows = self.connection.execute(
+            "SELECT entries.entry_id, entries.text, entries.minute, entries.edited FROM entries "
+            "JOIN days ON entries.day_id = days.id "
+            "WHERE days.journal_id = ? AND days.date = ? ORDER BY entries.position",
+            (self.journalId, OrdinalDate(day))).fetchall()
+        return FromRows(rows)
+
+    def ReadDays(self, days):
+        # Entries of several days in one query, days changed in memory take precedence
+        stored = [OrdinalDate(day) for day in days if day not in self.days.changed]
+        rowsByDate = {}
+        if stored:
+            with self.lock:
+                rows = self.connection.execute(
+                    "SELECT days.date, entries.entry_id, entries.text, entries.minute, entries.edited FROM days "
+                    "LEFT JOIN entries ON entries.day_id = days.id "
+                    f"WHERE days.journal_id = ? AND days.date IN ({', '.join('?' * len(stored))}) "
+                    "ORDER BY days.date, entries.position", (self.journalId, *stored)).fetchall()
+            for date, *entry in rows:
+                entries = rowsByDate.setdefault(date, [])
+                if entry[-1] is not None:
+                    entries.append(entry)
+        return [self.days.changed[day] if day in self.days.changed else FromRows(rowsByDate.get(OrdinalDate(day), ()))
+                for day in days]
+
+    def DayId(self, day):
+        # Row of the day, created if needed. Only called by writes, which bump its revision.
+        self.connection.execute("INSERT OR IGNORE INTO days (journal_id, date) VALUES (?, ?)",
+                                (self.journalId, OrdinalDate(day)))
+        dayId, revision = self.connection.execute("SELECT id, revision FROM days WHERE journal_id = ? AND date = ?",
+                                                  (self.journalId, OrdinalDate(day))).fetchone()
+        if day in self.revisions and revision != self.revisions[day]:
+            self.external[day] = None
+        self.connection.execute("UPDATE days SET revision = ? WHERE id = ?", (revision + 1, dayId))
+        self.revisions[day] = revision + 1
+        return dayId
+
+    def AppendEntry(self, day, entry):
+        _, entries = self.ChangeDay(day, lambda entries: WithEntry(entries, entry))
+        ioExecutor.submit(self.WriteEntry, day, entries, len(entries) - 1)
+
+    def UpdateEntry(self, day, entry):
+        _, entries = self.ChangeDay(day, lambda entries: WithEntry(entries, entry))
+        ioExecutor.submit(self.WriteText, day, entries, entry)
+
+    def DeleteEntry(self, day, entryId):
+        oldEntries, entries = self.ChangeDay(day, lambda entries: WithoutEntry(entries, entryId))
+        ioExecutor.submit(self.WriteRemoval, day, entries, entryId, EntryIndex(oldEntries, entryId))
+
+    def MoveEntry(self, day, entryId, position):
+        oldEntries, entries = self.ChangeDay(day, lambda entries: WithEntryMoved(entries, entryId, position))
+        start, end = EntryIndex(oldEntries, entryId), EntryIndex(entries, entryId)
+        ioExecutor.submit(self.WritePositions, day, entries, min(start, end), max(start, end) + 1)
+
+    def ChangeDay(self, day, change):
+        # Replace the entries of the day in memory by change(entries) and queue their write. The day is
+        # read and written under the lock, so a refresh on another thread can't drop the change.
+        # -> (entries before, entries after)
+        with self.lock:
+            oldEntries = self.days.changed[day] if day in self.days.changed else self.ReadStored(day)
+            entries = change(oldEntries)
+            self.days.changed[day] = entries
+            self.queued[day] = self.queued.get(day, 0) + 1
+        return oldEntries, entries
+
+    def WriteEntry(self, day, entries, position):
+        # A new entry is a single row insert
+        entry = entries[position]
+        with self.lock, self.connection:
+            dayId = self.DayId(day)
+            # Another connection may have added an entry with the same id after this one was added,
+            # this one then goes after it with the next free id
+            entryId, count = self.connection.execute(
+                "SELECT max(entry_id), count(*) FROM entries WHERE day_id = ?", (dayId,)).fetchone()
+            if count != position or self.connection.execute(
+                    "SELECT 1 FROM entries WHERE day_id = ? AND entry_id = ?", (dayId, entry.id)).fetchone():
+                position = count
+                if entryId is not None and entry.id <= entryId:
+                    # The queued writes of the entry follow it to its new id
+                    self.newIds[(day, entry.id)] = entryId + 1
+                    entry = Entry(entryId + 1, entry.text, entry.minute, entry.edited)
+                self.external[day] = None
+            self.connection.execute(
+                "INSERT INTO entries (day_id, position, entry_id, text, minute, edited) VALUES (?, ?, ?, ?, ?, ?)",
+                (dayId, position, entry.id, entry.text, entry.minute, entry.edited))
+            self.Written(day, entries)
+
+    def WriteText(self, day, entries, entry):
+        with self.lock, self.connection:
+            self.connection.execute(
+                "UPDATE entries SET text = ?, minute = ?, edited = ? WHERE day_id = ? AND entry_id = ?",
+                (entry.text, entry.minute, entry.edited, self.DayId(day), self.newIds.get((day, entry.id), entry.id)))
+            self.Written(day, entries)
+
+    def WriteRemoval(self, day, entries, entryId, position):
+        # The entries after the removed one move up by one
+        with self.lock, self.connection:
+            dayId = self.DayId(day)
+            self.connection.execute("DELETE FROM entries WHERE day_id = ? AND entry_id = ?",
+                                    (dayId, self.newIds.get((day, entryId), entryId)))
+            self.UpdatePositions(day, dayId, entries, position, len(entries))
+            self.Written(day, entries)
+
+    def WritePositions(self, day, entries, start, end):
+        with self.lock, self.connection:
+            self.UpdatePositions(day, self.DayId(day), entries, start, end)
+            self.Written(day, entries)
+
+    def UpdatePositions(self, day, dayId, entries, start, end):
+        self.connection.executemany("UPDATE entries SET position = ? WHERE day_id = ? AND entry_id = ?",
+                                    [(i, dayId, self.newIds.get((day, entries[i].id), entries[i].id))
+                                     for i in range(start, end)])
+
+    def Written(self, day, entries):
+        # Once on disk, the day is read back from the database unless it changed again meanwhile
+        self.days.known.add(day)
+        self.queued[day] -= 1
+        if not self.queued[day]:
+            del self.queued[day]
+            # Read back from the database from now on, with the new ids
+            for key in [key for key in self.newIds if key[0] == day]:
+                del self.newIds[key]
+        if self.days.changed.get(day) is entries:
+            del self.days.changed[day]
+
+    def Flush(self):
+        ioExecutor.submit(lambda: None).result()
+
+    def Refresh(self):
+        # Days other connections changed since the last refresh -> None, their previous entries
+        # aren't known anymore (or () for new days)
+        with self.lock:
+            changed, self.external = self.external, {}
+            # data_version only changes with the commits of other connections
+            dataVersion = self.connection.execute("PRAGMA data_version").fetchone()[0]
+            if dataVersion == self.dataVersion:
+                return changed
+            self.dataVersion = dataVersion
+            rows = self.connection.execute("SELECT date, revision FROM days WHERE journal_id = ?",
+                                           (self.journalId,)).fetchall()
+            for date, revision in rows:
+                day = DayOrdinal(date)
+                if self.revisions.get(day) != revision:
+                    changed[day] = None if day in self.revisions else ()
+                    self.revisions[day] = revision
+                    self.days.known.add(day)
+                    # Read from the database from now on, unless a write of ours is still queued
+                    if day not in self.queued:
+                        self.days.changed.pop(day, None)
+        return changed
+
+    def Close(self):
+        self.Flush()
+        with self.lock:
+            self.connection.close()
+
+    def Save(self):
+        # Every change is committed as it is made
+        self.Flush()
+
+    def WriteDays(self, days):
+        # Replace the whole journal, used when converting from another backend
+        with self.lock, self.connection:
+            self.connection.execute("DELETE FROM entries WHERE day_id IN (SELECT id FROM days WHERE journal_id = ?)",
+                                    (self.journalId,))
+            self.connection.execute("DELETE FROM days WHERE journal_id = ?", (self.journalId,))
+            for day, entries in days.items():
+                dayId = self.DayId(day)
+                self.connection.executemany(
+                    "INSERT INTO entries (day_id, position, entry_id, text, minute, edited) VALUES (?, ?, ?, ?, ?, ?)",
+                    [(dayId, i, entry.id, entry.text, entry.minute, entry.edited) for i, entry in enumerate(entries)])
+
+
+def ReadRecords(path):
+    # Complete records of a journal log, a torn record at its end and what follows are left out
+    try:
+        with open(path) as f:
+            for line in f:
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    return
+    except FileNotFoundError:
+        return
+
+
+def ScanDays(f):
+    # (date, offset, length) of every day of a stored journal, the days are located in the file
+    # without parsing their entries
+    if os.fstat(f.fileno()).st_size == 0:
+        return
+    with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+        position = m.find(b"{") + 1
+        depth, date, start = 0, None, None
+        while True:
+            match = JSON_TOKEN.search(m, position)
+            if match is None:
+                return
+            char, position = match.group(), match.end()
+            if char == b'"':
+                position = JSON_STRING_END.match(m, position).end()
+                if depth == 0:
+                    date = json.loads(m[match.start():position])
+            elif char in b"[{":
+                if depth == 0:
+                    start = match.start()
+                depth += 1
+            elif depth == 0:
+                # End of the journal
+                return
+            else:
+                depth -= 1
+                if depth == 0:
+                    yield date, start, position - start
+
+
+def FromRows(rows):
+    # (entry_id, text, minute, edited) rows of the entries table -> entries
+    return tuple(Entry(entryId, text, minute, bool(edited)) for entryId, text, minute, edited in rows)
+
+
+def RecordEntryId(record):
+    # Id of the entry a put, delete or move record changes
+    if "put" in record:
+        return record["put"]["id"]
+    return record["delete"] if "delete" in record else record.get("move")
+
+
+def RetargetRecord(record, entryId):
+    # The same operation on the entry with another id
+    if "put" in record:
+        return {**record, "put": {**record["put"], "id": entryId}}
+    if "delete" in record:
+        return {**record, "delete": entryId}
+    return {**record, "move": entryId}
+
+
+def ApplyRecord(entries, record):
+    # A log record holds either the whole day (older logs) or one entry operation
+    if "entries" in record:
+        return FromStored(record["entries"])
+    if "put" in record:
+        return WithEntry(entries, FromStored([record["put"]])[0])
+    if "delete" in record:
+        return WithoutEntry(entries, record["delete"])
+    if "move" in record:
+        return WithEntryMoved(entries, record["move"], record["position"])
+    return entries
+
+
+BACKENDS = {"json": JsonBackend, "sqlite": SqliteBackend}
+
+
+def OpenBackend(name, backend=None):
+    # Explicit backend, else the default one if the journal exists in it, else whichever format exists
+    if backend is None:
+        backend = DEFAULT_BACKEND
+        if not (JOURNALS_PATH / f"jrn_{name}{BACKENDS[backend].suffix}").exists():
+            for other, backendClass in BACKENDS.items():
+                if (JOURNALS_PATH / f"jrn_{name}{backendClass.suffix}").exists():
+                    backend = other
+                    break
+    return BACKENDS[backend](name)
+
+
+def JournalFiles(name):
+    return [path for backendClass in BACKENDS.values() for path in backendClass.Files(name)]
+
+
+def WrittenFiles(name):
+    # Files that change whenever the journal is written, by this process or another one. Built from the
+    # suffixes, the backups aren't listed since that takes a scan of the directory per journal.
+    return [JOURNALS_PATH / f"jrn_{name}{suffix}" for suffix in (".json", ".log", ".db", ".db-wal")]
+
+
+def ListJournals():
+    # Journal name -> main file of the journal, in whichever format it is stored
+    suffixes = {backendClass.suffix for backendClass in BACKENDS.values()}
+    journals = {}
+    if JOURNALS_PATH.exists():
+        for path in JOURNALS_PATH.glob("jrn_*"):
+            if path.suffix in suffixes:
+                journals.setdefault(path.stem[4:], path)
+    return journals
+
+
+def LastModified(name):
+    # Entries go to the journal's log or database journal, which change more recently than the main file
+    return max(os.path.getmtime(path) for path in WrittenFiles(name) if path.exists())
+
+
+def ReadJournal(name):
+    return type(OpenBackend(name)).ReadAll(name)
+
+
+def OpenReader(name):
+    # Read-only access to the journal's days one at a time, see JsonBackend.Reader
+    return type(OpenBackend(name)).Reader(name)
+
+
+def ConvertJournal(name, source, target):
+    # Copy every day of a journal from one backend into another
+    sourceBackend = BACKENDS[source](name)
+    sourceBackend.Create()
+    sourceBackend.Load()
+    targetBackend = BACKENDS[target](name)
+    targetBackend.Create()
+    targetBackend.WriteDays({day: sourceBackend.days[day] for day in sourceBackend.days})
+    return targetBackend
+
+
+def ImportJson(name):
+    # jrn_<name>.json -> jrn_<name>.db
+    return ConvertJournal(name, "json", "sqlite")
+
+
+def ExportJson(name):
+    # jrn_<name>.db -> jrn_<name>.json
+    return ConvertJournal(name, "sqlite", "json")
@@ -0,0 +1,23 @@
+import datetime as dt
+
+
+class MonthIndex:
+    # Days with entries as one bitmap per month: (year, month) -> int with bit d - 1 set if day d
+    # has entries, so showing a month of the calendar takes one lookup instead of a scan of the dates
+    def __init__(self, days=()):
+        self.months = {}
+        for day in days:
+            self.Set(day, True)
+
+    def Set(self, day, hasEntries):
+        date = dt.date.fromordinal(day)
+        key = (date.year, date.month)
+        bits = self.months.get(key, 0)
+        bits = bits | 1 << date.day - 1 if hasEntries else bits & ~(1 << date.day - 1)
+        if bits:
+            self.months[key] = bits
+        else:
+            self.months.pop(key, None)
+
+    def Month(self, year, month):
+        return self.months.get((year, month), 0)
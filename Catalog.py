@@ -0,0 +1,110 @@
+import json
+import os
+import threading
+from Backends import BACKENDS, JOURNALS_PATH, ioExecutor, ReadJournal
+from Storage import DumpJson
+
+CATALOG_PATH = JOURNALS_PATH / "catalog.json"
+# Files next to a journal's main file that change when it is written
+SIDECAR_SUFFIXES = (".log", ".idx", ".db-wal", ".db-shm")
+
+
+class Catalog:
+    # Cached metadata of every journal: name -> {mtime, ctime, size, entries, days}.
+    # A record is reused as long as the journal's files still have the recorded mtime and size,
+    # so listing the journals costs one directory scan instead of reading every journal.
+    def __init__(self, path=CATALOG_PATH):
+        self.path = path
+        self.journals = {}
+        self.lock = threading.Lock()
+        self.saveScheduled = False
+        self.Load()
+
+    def Load(self):
+        try:
+            with open(self.path) as f:
+                self.journals = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            self.journals = {}
+
+    def Save(self):
+        with self.lock:
+            self.saveScheduled = False
+            journals = {name: dict(record) for name, record in self.journals.items()}
+        if JOURNALS_PATH.exists():
+            DumpJson(journals, self.path)
+
+    def ScheduleSave(self):
+        with self.lock:
+            if self.saveScheduled:
+                return
+            self.saveScheduled = True
+        ioExecutor.submit(self.Save)
+
+    @staticmethod
+    def StatJournals():
+        # One directory scan: journal name -> (mtime, ctime, size) over the main file and its sidecars
+        if not JOURNALS_PATH.exists():
+            return {}
+        with os.scandir(JOURNALS_PATH) as it:
+            files = {entry.name: entry.stat() for entry in it if entry.name.startswith("jrn_")}
+        suffixes = [backendClass.suffix for backendClass in BACKENDS.values()]
+        stats = {}
+        for fileName, stat in files.items():
+            name, suffix = os.path.splitext(fileName)
+            if suffix not in suffixes or name[4:] in stats:
+                continue
+            related = [files[name + sidecar] for sidecar in SIDECAR_SUFFIXES if name + sidecar in files]
+            stats[name[4:]] = (max([stat.st_mtime] + [r.st_mtime for r in related]), stat.st_ctime,
+                               stat.st_size + sum(r.st_size for r in related))
+        return stats
+
+    def Scan(self):
+        # Up to date records of every journal, counting entries only for journals changed on disk
+        stats = self.StatJournals()
+        changed = False
+        with self.lock:
+            for name in [name for name in self.journals if name not in stats]:
+                del self.journals[name]
+                changed = True
+            stale = [name for name, (mtime, ctime, size) in stats.items()
+                     if self.journals.get(name, {}).get("mtime") != mtime or self.journals[name].get("size") != size]
+        for name in stale:
+            mtime, ctime, size = stats[name]
+            try:
+                days = ReadJournal(name)
+            except (OSError, ValueError):
+                days = {}
+            record = {"mtime": mtime, "ctime": ctime, "size": size,
+                      "entries": sum(len(entries) for entries in days.values()),
+                      "days": sum(1 for entries in days.values() if entries)}
+            with self.lock:
+                self.journals[name] = record
+            changed = True
+        if changed:
+            self.ScheduleSave()
+        with self.lock:
+            return {name: dict(record) for name, record in self.journals.items()}
+
+    def UpdateDay(self, name, day, entries, oldEntries):
+        # Journal listener: adjust the counts now, refresh the file stats once the write is on disk
+        with self.lock:
+            record = self.journals.get(name)
+            if record is None:
+                return
+            if oldEntries is None:
+                # Changed by another process, the journal is counted again on the next scan
+                record["mtime"] = None
+                return
+            record["entries"] += len(entries) - len(oldEntries)
+            record["days"] += bool(entries) - bool(oldEntries)
+        ioExecutor.submit(self.Restat, name)
+
+    def Restat(self, name):
+        stat = self.StatJournals().get(name)
+        with self.lock:
+            record = self.journals.get(name)
+            if stat is None or record is None:
+                return
+            record["mtime"], record["ctime"], record["size"] = stat
+        self.ScheduleSave()
@@ -0,0 +1,49 @@
+import pathlib
+import threading
+from Backends import ioExecutor
+from Storage import AtomicWrite
+
+DRAFTS_PATH = pathlib.Path("./Drafts")
+
+
+def DraftPath(name):
+    return DRAFTS_PATH / f"drf_{name}.txt"
+
+
+def ReadDraft(name):
+    # Unsubmitted entry left by the last session of the journal, empty if there is none
+    try:
+        return DraftPath(name).read_text(encoding="utf-8")
+    except OSError:
+        return ""
+
+
+class DraftWriter:
+    # Writes the unsubmitted entry of a journal in the background. Snapshots taken while a write
+    # is still queued replace its text, so only the latest draft is written.
+    def __init__(self, name):
+        self.path = DraftPath(name)
+        self.text = ""
+        self.lock = threading.Lock()
+        self.writeScheduled = False
+
+    def Save(self, text):
+        with self.lock:
+            self.text = text
+            if self.writeScheduled:
+                return
+            self.writeScheduled = True
+        ioExecutor.submit(self.Write)
+
+    def Discard(self):
+        self.Save("")
+
+    def Write(self):
+        with self.lock:
+            self.writeScheduled = False
+            text = self.text
+        if text.split() != []:
+            DRAFTS_PATH.mkdir(exist_ok=True)
+            AtomicWrite(self.path, text)
+        else:
+            self.path.unlink(missing_ok=True)
@@ -0,0 +1,124 @@
+import datetime as dt
+import re
+
+TIME_PATTERN = re.compile(r"(\d{1,2}):(\d{2})\s*([AP]M)", re.IGNORECASE)
+EDITED_SUFFIX = " (Edited)"
+# One pass over the text escapes it and wraps every line in its own <textarea>
+MARKUP_TABLE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", "\n": "</textarea><br><textarea>"})
+
+
+class Entry:
+    # One entry of a journal day: its id (unique within the day), the text as it was typed,
+    # the minute of the day it was written at and whether it was edited afterwards. Markup and
+    # display times are generated when they are needed instead of being kept next to every entry.
+    __slots__ = ("id", "text", "minute", "edited")
+
+    def __init__(self, id, text, minute, edited=False):
+        self.id = id
+        self.text = text
+        self.minute = minute
+        self.edited = edited
+
+    def __repr__(self):
+        return f"Entry({self.id!r}, {self.text!r}, {self.minute!r}, {self.edited!r})"
+
+    def Time(self):
+        return TimeText(self.minute) + (EDITED_SUFFIX if self.edited else "")
+
+
+def DayOrdinal(date):
+    # "2022-06-29" -> proleptic Gregorian ordinal, days sort and subtract as plain integers
+    return dt.date.fromisoformat(date).toordinal()
+
+
+def OrdinalDate(day):
+    return dt.date.fromordinal(day).isoformat()
+
+
+def TimeText(minute):
+    # 960 -> "4:00 PM"
+    hour, minute = divmod(minute, 60)
+    return f"{(hour - 1) % 12 + 1}:{minute:02d} {'AM' if hour < 12 else 'PM'}"
+
+
+def ParseTime(time):
+    # "4:00 PM (Edited)" -> (960, True)
+    match = TIME_PATTERN.match(time)
+    if match is None:
+        return 0, time.endswith(EDITED_SUFFIX)
+    hour, minute, period = int(match[1]) % 12, int(match[2]), match[3].upper()
+    return (hour + 12 if period == "PM" else hour) * 60 + minute, time.endswith(EDITED_SUFFIX)
+
+
+def Markup(text):
+    # Text as it is shown in read mode
+    return f"<textarea>{text.translate(MARKUP_TABLE)}</textarea><br>"
+
+
+def RenderDay(entries, color):
+    # Entries of a day as they are shown in read mode, each under a header with its time.
+    # The header is formatted once per day, each entry is rendered in a single pass.
+    header = f'<h4 style="text-decoration: underline; color: {color}">\
+            {{}}</h4>'
+    return "".join([header.format(entry.Time()) + Markup(entry.text) for entry in entries])
+
+
+def Unmarkup(html):
+    # Markup of the first storage format back to the text as it was typed
+    text = html.replace("<textarea>", "").replace("</textarea>", "").replace("<br>", "\n").\
+        replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
+    # Every line ends with a <br>, the last one doesn't start a new line
+    return text[:-1] if text.endswith("\n") else text
+
+
+def FromStored(entries):
+    # [{"id": ..., "text": ..., "minute": ..., "edited": true}, ...] as written on disk -> compact entries.
+    # Entries of older formats ([markup, "4:00 PM"], or without an id) are converted as they are read.
+    return tuple(Entry(entry.get("id", i), entry["text"], entry["minute"], entry.get("edited", False))
+                 if isinstance(entry, dict) else Entry(i, Unmarkup(entry[0]), *ParseTime(entry[1]))
+                 for i, entry in enumerate(entries))
+
+
+def ToStored(entries):
+    # "edited" is only written for edited entries
+    return [{"id": entry.id, "text": entry.text, "minute": entry.minute, "edited": True} if entry.edited
+            else {"id": entry.id, "text": entry.text, "minute": entry.minute} for entry in entries]
+
+
+def EntryIndex(entries, entryId):
+    # Position of the entry with the given id in the day, or None
+    for i, entry in enumerate(entries):
+        if entry.id == entryId:
+            return i
+    return None
+
+
+def NextId(entries):
+    return max((entry.id for entry in entries), default=-1) + 1
+
+
+# Entry operations on a day's entries. Days are immutable tuples, every operation returns a new one
+# and applying an operation twice gives the same day, so logged operations can be replayed safely.
+
+def WithEntry(entries, entry):
+    # Replace the entry with the same id, or append it
+    i = EntryIndex(entries, entry.id)
+    if i is None:
+        return entries + (entry,)
+    return entries[:i] + (entry,) + entries[i + 1:]
+
+
+def WithoutEntry(entries, entryId):
+    i = EntryIndex(entries, entryId)
+    if i is None:
+        return entries
+    return entries[:i] + entries[i + 1:]
+
+
+def WithEntryMoved(entries, entryId, position):
+    i = EntryIndex(entries, entryId)
+    if i is None:
+        return entries
+    rest = entries[:i] + entries[i + 1:]
+    position = max(0, min(position, len(rest)))
+    return rest[:position] + (entries[i],) + rest[position:]
@@ -0,0 +1,131 @@
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+
+# Timings are only recorded when the app is started with JOURNAL_INSTRUMENT=1. Otherwise Timed returns
+# the functions unchanged and Span a shared no-op, so instrumented code runs exactly as without it.
+ENABLED = os.environ.get("JOURNAL_INSTRUMENT", "") not in ("", "0")
+# Where the report is written at exit (if set) and by the debug shortcut
+REPORT_PATH = os.environ.get("JOURNAL_INSTRUMENT_REPORT", "./instrumentation.json")
+# Upper bounds (ms) of the histogram buckets, the last bucket counts everything slower
+BUCKETS_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+class Stat:
+    __slots__ = ("count", "total", "max", "histogram")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.histogram = [0] * (len(BUCKETS_MS) + 1)
+
+    def Add(self, ms):
+        self.count += 1
+        self.total += ms
+        self.max = max(self.max, ms)
+        for i, bound in enumerate(BUCKETS_MS):
+            if ms <= bound:
+                self.histogram[i] += 1
+                return
+        self.histogram[-1] += 1
+
+
+class Registry:
+    # Counts, cumulative time and histogram of every instrumented name. Records come from the GUI
+    # thread as well as from workers, so they are taken under a lock.
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.stats = {}
+
+    def Record(self, name, ms):
+        with self.lock:
+            stat = self.stats.get(name)
+            if stat is None:
+                stat = self.stats[name] = Stat()
+            stat.Add(ms)
+
+    def Reset(self):
+        with self.lock:
+            self.stats = {}
+
+    def Report(self):
+        labels = [f"<={bound}ms" for bound in BUCKETS_MS] + [f">{BUCKETS_MS[-1]}ms"]
+        with self.lock:
+            return {name: {"count": stat.count, "totalMs": stat.total, "meanMs": stat.total / stat.count,
+                           "maxMs": stat.max, "histogram": dict(zip(labels, stat.histogram))}
+                    for name, stat in sorted(self.stats.items())}
+
+    def TextReport(self):
+        lines = [f"{'name':<28} {'count':>7} {'total':>10} {'mean':>9} {'max':>9}  (ms)"]
+        for name, stat in sorted(self.Report().items(), key=lambda item: -item[1]["totalMs"]):
+            lines.append(f"{name:<28} {stat['count']:>7} {stat['totalMs']:>10.1f} {stat['meanMs']:>9.2f} "
+                         f"{stat['maxMs']:>9.2f}")
+        return "\n".join(lines)
+
+    def Dump(self, path=REPORT_PATH):
+        with open(path, 'w') as f:
+            json.dump(self.Report(), f, indent=2)
+
+
+registry = Registry()
+
+
+def Timed(name):
+    # Decorator recording every call of the function under the given name
+    def Decorate(func):
+        if not ENABLED:
+            return func
+        # Qt signals pass their arguments to slots that don't take them (clicked passes checked),
+        # PyQt drops them for plain functions, the wrapper has to drop them itself
+        code = func.__code__
+        argCount = None if code.co_flags & inspect.CO_VARARGS else code.co_argcount
+
+        @functools.wraps(func)
+        def Wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args[:argCount], **kwargs)
+            finally:
+                registry.Record(name, (time.perf_counter() - start) * 1000)
+        return Wrapper
+    return Decorate
+
+
+class _Span:
+    __slots__ = ("name", "start")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+
+    def __exit__(self, *exc):
+        registry.Record(self.name, (time.perf_counter() - self.start) * 1000)
+
+
+class _NoSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        pass
+
+    def __exit__(self, *exc):
+        pass
+
+
+NO_SPAN = _NoSpan()
+
+
+def Span(name):
+    # Context manager recording the time spent in its block under the given name
+    return _Span(name) if ENABLED else NO_SPAN
+
+
+if ENABLED and "JOURNAL_INSTRUMENT_REPORT" in os.environ:
+    import atexit
+    atexit.register(registry.Dump)
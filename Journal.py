@@ -1,70 +1,180 @@
-import json
 import datetime as dt
-import pathlib as pathlib
+import bisect
+from collections import OrderedDict
+from Backends import OpenBackend
+from Entries import Entry, RenderDay, EntryIndex, NextId
+from Instrumentation import Timed, Span
+
+# Number of rendered days kept for read mode
+RENDER_CACHE_SIZE = 256
+# Days read from disk at a time by the range queries
+RANGE_BATCH_SIZE = 64
 
 
 class Journal:
-    def __init__(self, name):
+    def __init__(self, name, backend=None):
         self.name = name.strip().lower()
-        self.date = str(dt.date.today())
+        # Days are proleptic Gregorian ordinals, see Entries.DayOrdinal
+        self.date = dt.date.today().toordinal()
         self.jrnDict = {}
+        self.dates = []
+        self.renderCache = OrderedDict()
+        # Called with (name, date, entries, oldEntries) whenever a day changes. oldEntries is None for
+        # days another process changed when their previous entries aren't known anymore.
+        self.listeners = []
+        self.storage = OpenBackend(self.name, backend)
         self.CreateJournals()
         self.Load()
         if self.date not in self.jrnDict:
-            self.jrnDict[self.date] = []
+            self.jrnDict[self.date] = ()
+            bisect.insort(self.dates, self.date)
 
     def CreateJournals(self):
-        path = pathlib.Path("./Journals")
-        filePath = pathlib.Path(f"./Journals/jrn_{self.name}.json")
-        if path.exists():
-            if not filePath.exists():
-                with open(filePath, 'w') as f:
-                    json.dump(self.jrnDict, f)
-
-        else:
-            path.mkdir()
-            with open(filePath, 'w') as f:
-                json.dump(self.jrnDict, f)
+        self.storage.Create()
 
+    @Timed("Journal.Load")
     def Load(self):
-        path = pathlib.Path(f"./Journals/jrn_{self.name}.json")
-        with open(path) as f:
-            self.jrnDict = json.load(f)
+        self.storage.Load()
+        self.jrnDict = self.storage.days
+        # Ordinals sort chronologically, regardless of the order the days were stored in
+        self.dates = sorted(self.jrnDict)
 
+    @Timed("Journal.Save")
     def Save(self):
-        path = pathlib.Path(f"./Journals/jrn_{self.name}.json")
-        with open(path, 'w') as f:
-            json.dump(self.jrnDict, f)
+        self.storage.Save()
+
+    def Flush(self):
+        # Block until every queued write has reached the disk
+        self.storage.Flush()
+
+    def Close(self):
+        self.storage.Close()
 
     def AddEntry(self, entry, time):
+        # time is the datetime the entry was written at
         if entry.split() != []:
-            entry = self.CleanEntry(entry)
-            self.jrnDict[self.date].append((entry, time))
-            self.Save()
-
-    def EditEntry(self, newEntry, time):
-        if newEntry.split() != []:
-            newEntry = self.CleanEntry(newEntry)
-            self.jrnDict[self.date] = [(newEntry, time + " (Edited)")]
-            self.Save()
+            oldEntries = self.jrnDict[self.date]
+            self.storage.AppendEntry(self.date, Entry(NextId(oldEntries), entry, time.hour * 60 + time.minute))
+            self.DayChanged(self.date, oldEntries)
+
+    def DayEntries(self, date=None):
+        # Entries of the day (today by default), as they were typed, in their order
+        return self.jrnDict[self.date if date is None else date]
+
+    def GetEntry(self, entryId, date=None):
+        entries = self.DayEntries(date)
+        index = EntryIndex(entries, entryId)
+        if index is None:
+            raise KeyError(entryId)
+        return entries[index]
+
+    def EditEntry(self, entryId, newEntry, date=None):
+        # Replace the text of one entry, an empty text deletes it
+        date = self.date if date is None else date
+        if newEntry.split() == []:
+            self.DeleteEntry(entryId, date)
+            return
+        entry = self.GetEntry(entryId, date)
+        if newEntry == entry.text:
+            return
+        oldEntries = self.jrnDict[date]
+        self.storage.UpdateEntry(date, Entry(entryId, newEntry, entry.minute, True))
+        self.DayChanged(date, oldEntries)
+
+    def DeleteEntry(self, entryId, date=None):
+        date = self.date if date is None else date
+        self.GetEntry(entryId, date)
+        oldEntries = self.jrnDict[date]
+        self.storage.DeleteEntry(date, entryId)
+        self.DayChanged(date, oldEntries)
+
+    def MoveEntry(self, entryId, position, date=None):
+        # Move one entry to the given position among the day's entries
+        date = self.date if date is None else date
+        self.GetEntry(entryId, date)
+        oldEntries = self.jrnDict[date]
+        self.storage.MoveEntry(date, entryId, position)
+        self.DayChanged(date, oldEntries)
+
+    def ReadChanges(self):
+        # Days changed on disk by other processes -> their previous entries, can run off the GUI thread
+        return self.storage.Refresh()
+
+    def MergeChanges(self, changes):
+        # Take over days read by ReadChanges, only they are re-rendered and passed to the listeners.
+        # -> the dates that changed
+        for date in sorted(changes):
+            if self.DateIndex(date) is None:
+                bisect.insort(self.dates, date)
+            self.DayChanged(date, changes[date])
+        return sorted(changes)
+
+    def DayChanged(self, date, oldEntries):
+        self.InvalidateRender(date)
+        for listener in self.listeners:
+            listener(self.name, date, self.jrnDict[date], oldEntries)
+
+    def DateIndex(self, date):
+        # Position of the date in the sorted date index, or None if it has no entry
+        index = bisect.bisect_left(self.dates, date)
+        if index < len(self.dates) and self.dates[index] == date:
+            return index
+        return None
+
+    def PreviousDate(self, date):
+        # Latest date with an entry on or before the given date
+        index = bisect.bisect_right(self.dates, date)
+        return self.dates[index - 1] if index > 0 else None
+
+    def NextDate(self, date):
+        # Earliest date with an entry on or after the given date
+        index = bisect.bisect_left(self.dates, date)
+        return self.dates[index] if index < len(self.dates) else None
+
+    def IterDays(self, start=None, end=None, newestFirst=False, batchSize=RANGE_BATCH_SIZE):
+        # Days from start to end (ordinals, both included, open if None) as batches of up to batchSize
+        # (date, entries) pairs. Each batch is read from disk when it is reached and nothing is kept,
+        # so paging through a whole journal takes the memory of one batch.
+        first = 0 if start is None else bisect.bisect_left(self.dates, start)
+        last = len(self.dates) if end is None else bisect.bisect_right(self.dates, end)
+        if newestFirst:
+            for stop in range(last, first, -batchSize):
+                dates = self.dates[max(first, stop - batchSize):stop][::-1]
+                yield list(zip(dates, self.storage.ReadDays(dates)))
         else:
-            self.jrnDict[self.date] = []
+            for begin in range(first, last, batchSize):
+                dates = self.dates[begin:min(last, begin + batchSize)]
+                yield list(zip(dates, self.storage.ReadDays(dates)))
+
+    def IterMonth(self, year, month, newestFirst=False, batchSize=RANGE_BATCH_SIZE):
+        start = dt.date(year, month, 1)
+        end = dt.date(year + month // 12, month % 12 + 1, 1) - dt.timedelta(1)
+        return self.IterDays(start.toordinal(), end.toordinal(), newestFirst, batchSize)
 
-    def GetEntries(self, key, color, mode):
+    def IterEntries(self, start=None, end=None, newestFirst=False, batchSize=RANGE_BATCH_SIZE):
+        # (date, entry) one at a time over IterDays, the entries of a day in their order (reversed newest first)
+        for batch in self.IterDays(start, end, newestFirst, batchSize):
+            for date, entries in batch:
+                for entry in (reversed(entries) if newestFirst else entries):
+                    yield date, entry
+
+    @Timed("Journal.GetEntries")
+    def GetEntries(self, key, color, mode, version=0):
         entries = ""
         if mode == "read":
-            for entry, time in self.jrnDict[key]:
-                entries += f'<h4 style="text-decoration: underline; color: {color}">\
-                    {time}</h4>{entry}'
+            # Rendered days are cached per color and settings version
+            cacheKey = (key, color, version)
+            entries = self.renderCache.get(cacheKey)
+            if entries is not None:
+                self.renderCache.move_to_end(cacheKey)
+                return entries
+            with Span("Journal.Render"):
+                entries = RenderDay(self.jrnDict[key], color)
+            self.renderCache[cacheKey] = entries
+            if len(self.renderCache) > RENDER_CACHE_SIZE:
+                self.renderCache.popitem(last=False)
             return entries
-        elif mode == "edit":
-            for entry, time in self.jrnDict[key]:
-                entries += entry.replace("<textarea>", "").replace("</textarea>", "").\
-                    replace("<br>", "\n").replace("&lt;", "<").replace("&gt;", ">") + "...\n"
-            return entries[:-5]
-
-    def CleanEntry(self, entry):
-        entry = entry.replace("<", "&lt;")
-        entry = entry.replace(">", "&gt;")
-        entry = "".join([f"<textarea>{sub}</textarea><br>" for sub in entry.split("\n")])
-        return entry
\ No newline at end of file
+
+    def InvalidateRender(self, date):
+        for cacheKey in [cacheKey for cacheKey in self.renderCache if cacheKey[0] == date]:
+            del self.renderCache[cacheKey]
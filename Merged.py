@@ -0,0 +1,35 @@
+import heapq
+from Backends import ListJournals, OpenReader
+from Entries import RenderDay
+
+
+def NewestFirst(reader, rank, name):
+    # (date, -rank, name) of the journal's days, newest first. The negated rank keeps journals in
+    # name order within a day of the merge.
+    for date in reversed(reader.dates):
+        yield date, -rank, name
+
+
+class MergedJournals:
+    # Days of every journal in one timeline, newest first, journals of the same day in name order.
+    # The journals' sorted dates are combined by a streaming k-way merge that is only advanced as far
+    # as the timeline has been paged, and entries stay on disk until their day is shown.
+    # The journals are only read, see JsonBackend.Reader.
+    def __init__(self, names=None):
+        names = sorted(ListJournals() if names is None else names)
+        self.journals = {name: OpenReader(name) for name in names}
+        self.count = sum(len(reader.dates) for reader in self.journals.values())
+        self.merge = heapq.merge(*(NewestFirst(reader, rank, name)
+                                   for rank, (name, reader) in enumerate(self.journals.items())), reverse=True)
+        self.keys = []
+
+    def Key(self, day):
+        # (date, journal name) of the day-th day of the timeline
+        while len(self.keys) <= day:
+            date, _, name = next(self.merge)
+            self.keys.append((date, name))
+        return self.keys[day]
+
+    def GetEntries(self, day, color):
+        date, name = self.Key(day)
+        return RenderDay(self.journals[name].ReadDay(date), color)
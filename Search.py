@@ -0,0 +1,155 @@
+import json
+import math
+import pathlib
+import re
+import bisect
+import threading
+from collections import Counter
+from Backends import ioExecutor, ListJournals, LastModified, ReadJournal
+from Storage import DumpJson
+from Entries import OrdinalDate
+
+INDEX_PATH = pathlib.Path("./Search/index.json")
+TOKEN_PATTERN = re.compile(r"\w+")
+
+
+def Tokenize(text):
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+class SearchIndex:
+    # Inverted index over the entries of every journal. A document is one day of one journal,
+    # keyed "<journal>/<date>". Only the per-document term counts are persisted, the postings
+    # are rebuilt from them on load.
+    def __init__(self, path=INDEX_PATH):
+        self.path = path
+        self.docs = {}          # docKey -> {token: count}
+        self.postings = {}      # token -> {docKey: count}
+        self.stamps = {}        # journal -> LastModified of the journal when it was indexed
+        self.vocabulary = None  # sorted tokens for prefix lookups, rebuilt lazily
+        self.lock = threading.Lock()
+        self.saveScheduled = False
+        self.Load()
+
+    def Load(self):
+        try:
+            with open(self.path) as f:
+                data = json.load(f)
+        except (OSError, json.JSONDecodeError):
+            return
+        self.stamps = data["stamps"]
+        for docKey, counts in data["docs"].items():
+            self.AddDoc(docKey, counts)
+
+    def Save(self):
+        with self.lock:
+            self.saveScheduled = False
+            data = {"stamps": dict(self.stamps), "docs": dict(self.docs)}
+        if not self.path.parent.exists():
+            self.path.parent.mkdir()
+        DumpJson(data, self.path)
+
+    def ScheduleSave(self):
+        # Saves requested while one is pending are written together
+        with self.lock:
+            if self.saveScheduled:
+                return
+            self.saveScheduled = True
+        ioExecutor.submit(self.Save)
+
+    def AddDoc(self, docKey, counts):
+        self.docs[docKey] = counts
+        for token, count in counts.items():
+            self.postings.setdefault(token, {})[docKey] = count
+        self.vocabulary = None
+
+    def RemoveDoc(self, docKey):
+        for token in self.docs.pop(docKey, {}):
+            postings = self.postings[token]
+            del postings[docKey]
+            if not postings:
+                del self.postings[token]
+        self.vocabulary = None
+
+    def IndexDay(self, jrnName, day, entries):
+        docKey = f"{jrnName}/{OrdinalDate(day)}"
+        counts = dict(Counter(token for entry in entries for token in Tokenize(entry.text)))
+        with self.lock:
+            self.RemoveDoc(docKey)
+            if counts:
+                self.AddDoc(docKey, counts)
+
+    def UpdateDay(self, jrnName, day, entries, oldEntries):
+        # Runs after the journal's own queued write, so the stamp matches the file on disk
+        ioExecutor.submit(self.IndexDayAndStamp, jrnName, day, entries)
+
+    def IndexDayAndStamp(self, jrnName, day, entries):
+        self.IndexDay(jrnName, day, entries)
+        with self.lock:
+            self.stamps[jrnName] = LastModified(jrnName)
+        self.ScheduleSave()
+
+    def Refresh(self):
+        # Re-index journals changed since they were last indexed and drop deleted ones
+        journals = ListJournals()
+        changed = False
+        for jrnName in list(self.stamps):
+            if jrnName not in journals:
+                with self.lock:
+                    for docKey in [docKey for docKey in self.docs if docKey.startswith(jrnName + "/")]:
+                        self.RemoveDoc(docKey)
+                    del self.stamps[jrnName]
+                changed = True
+        for jrnName in journals:
+            stamp = LastModified(jrnName)
+            if self.stamps.get(jrnName) == stamp:
+                continue
+            days = ReadJournal(jrnName)
+            dates = {OrdinalDate(day) for day in days}
+            with self.lock:
+                for docKey in [docKey for docKey in self.docs if docKey.startswith(jrnName + "/")]:
+                    if docKey.split("/", 1)[1] not in dates:
+                        self.RemoveDoc(docKey)
+            for day, entries in days.items():
+                self.IndexDay(jrnName, day, entries)
+            with self.lock:
+                self.stamps[jrnName] = stamp
+            changed = True
+        if changed:
+            self.ScheduleSave()
+
+    def Matches(self, token, isPrefix):
+        if not isPrefix:
+            return self.postings.get(token, {})
+        if self.vocabulary is None:
+            self.vocabulary = sorted(self.postings)
+        # Merge the postings of every token starting with the prefix
+        matches = {}
+        i = bisect.bisect_left(self.vocabulary, token)
+        while i < len(self.vocabulary) and self.vocabulary[i].startswith(token):
+            for docKey, count in self.postings[self.vocabulary[i]].items():
+                matches[docKey] = matches.get(docKey, 0) + count
+            i += 1
+        return matches
+
+    def Query(self, text, limit=50):
+        # Days containing every word of the query (the last one as a prefix, for search as you type),
+        # ranked by tf-idf. Returns [(journal, date, score)], best first.
+        tokens = Tokenize(text)
+        if not tokens:
+            return []
+        with self.lock:
+            total = len(self.docs) or 1
+            scores = None
+            for i, token in enumerate(tokens):
+                matches = self.Matches(token, i == len(tokens) - 1 and not text[-1:].isspace())
+                if not matches:
+                    return []
+                idf = math.log(1 + total / len(matches))
+                if scores is None:
+                    scores = {docKey: count * idf for docKey, count in matches.items()}
+                else:
+                    scores = {docKey: score + matches[docKey] * idf
+                              for docKey, score in scores.items() if docKey in matches}
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)[:limit]
+        return [(*docKey.split("/", 1), score) for docKey, score in ranked]
@@ -0,0 +1,130 @@
+import datetime as dt
+try:
+    import numpy as np
+except ImportError:
+    # The statistics are computed in plain Python, which takes longer on large journals
+    np = None
+
+# Ordinal of 1970-01-01, day 0 of NumPy's datetime64[D]
+EPOCH_ORDINAL = dt.date(1970, 1, 1).toordinal()
+
+
+class JournalStats:
+    # Every entry of a journal as columns (day ordinal, minute of the day, word count), so the
+    # statistics take a few vectorized passes instead of a walk over the journal. Built once per
+    # session, then kept up to date a day at a time by the journal's listeners: changed days are
+    # held until the summary is next computed and merged into the columns in one pass.
+    # The summary is cached until a day changes.
+    def __init__(self, days=(), minutes=(), words=()):
+        if np is None:
+            self.days, self.minutes, self.words = list(days), list(minutes), list(words)
+        else:
+            self.days = np.asarray(days, np.int32)
+            self.minutes = np.asarray(minutes, np.int16)
+            self.words = np.asarray(words, np.int32)
+        # Day -> [(minute, words)] of the days changed since the columns were built
+        self.changedDays = {}
+        self.summary = None
+
+    @classmethod
+    def FromJournal(cls, jrn):
+        days, minutes, words = [], [], []
+        for batch in jrn.IterDays():
+            for day, entries in batch:
+                for entry in entries:
+                    days.append(day)
+                    minutes.append(entry.minute)
+                    words.append(len(entry.text.split()))
+        return cls(days, minutes, words)
+
+    def SetDay(self, day, entries):
+        # Replace the entries of one day
+        self.changedDays[day] = [(entry.minute, len(entry.text.split())) for entry in entries]
+        self.summary = None
+
+    def Summary(self, today):
+        if self.summary is None or self.summary["today"] != today:
+            self.MergeChangedDays()
+            self.summary = self.ComputePlain(today) if np is None else self.Compute(today)
+        return self.summary
+
+    def MergeChangedDays(self):
+        if not self.changedDays:
+            return
+        days = [day for day, entries in self.changedDays.items() for _ in entries]
+        minutes = [minute for entries in self.changedDays.values() for minute, _ in entries]
+        words = [count for entries in self.changedDays.values() for _, count in entries]
+        if np is None:
+            keep = [i for i, day in enumerate(self.days) if day not in self.changedDays]
+            self.days = [self.days[i] for i in keep] + days
+            self.minutes = [self.minutes[i] for i in keep] + minutes
+            self.words = [self.words[i] for i in keep] + words
+        else:
+            keep = ~np.isin(self.days, np.fromiter(self.changedDays, np.int32, len(self.changedDays)))
+            self.days = np.concatenate([self.days[keep], np.array(days, np.int32)])
+            self.minutes = np.concatenate([self.minutes[keep], np.array(minutes, np.int16)])
+            self.words = np.concatenate([self.words[keep], np.array(words, np.int32)])
+        self.changedDays = {}
+
+    def Compute(self, today):
+        activeDays = np.unique(self.days)
+        # Runs of consecutive days, a streak is still current if its last day is today or yesterday
+        longestStreak = currentStreak = 0
+        if len(activeDays):
+            breaks = np.flatnonzero(np.diff(activeDays) != 1)
+            starts = np.concatenate(([0], breaks + 1))
+            ends = np.concatenate((breaks, [len(activeDays) - 1]))
+            lengths = ends - starts + 1
+            longestStreak = int(lengths.max())
+            currentStreak = int(lengths[-1]) if activeDays[-1] >= today - 1 else 0
+        months = (self.days.astype(np.int64) - EPOCH_ORDINAL).astype("datetime64[D]").astype("datetime64[M]")
+        monthKeys, monthIndex = np.unique(months, return_inverse=True)
+        monthWords = np.bincount(monthIndex, weights=self.words, minlength=len(monthKeys))
+        return {
+            "today": today,
+            "entries": len(self.days),
+            "words": int(self.words.sum()),
+            "activeDays": len(activeDays),
+            "currentStreak": currentStreak,
+            "longestStreak": longestStreak,
+            "wordsPerDay": float(self.words.sum() / len(activeDays)) if len(activeDays) else 0.0,
+            "wordsPerMonth": [(str(month), int(words)) for month, words in zip(monthKeys, monthWords)],
+            # Entries by hour of the day and by weekday (Monday first, ordinal 1 was a Monday)
+            "hours": np.bincount(self.minutes // 60, minlength=24).tolist(),
+            "weekdays": np.bincount((self.days + 6) % 7, minlength=7).tolist(),
+        }
+
+    def ComputePlain(self, today):
+        # Compute without NumPy, same results
+        activeDays = sorted(set(self.days))
+        longestStreak = currentStreak = 0
+        for i, day in enumerate(activeDays):
+            currentStreak = currentStreak + 1 if i > 0 and day == activeDays[i - 1] + 1 else 1
+            longestStreak = max(longestStreak, currentStreak)
+        if activeDays and activeDays[-1] < today - 1:
+            currentStreak = 0
+        dayMonths = {}
+        for day in activeDays:
+            date = dt.date.fromordinal(day)
+            dayMonths[day] = f"{date.year:04d}-{date.month:02d}"
+        monthWords = {}
+        for day, words in zip(self.days, self.words):
+            monthWords[dayMonths[day]] = monthWords.get(dayMonths[day], 0) + words
+        hours = [0] * 24
+        for minute in self.minutes:
+            hours[minute // 60] += 1
+        weekdays = [0] * 7
+        for day in self.days:
+            weekdays[(day + 6) % 7] += 1
+        return {
+            "today": today,
+            "entries": len(self.days),
+            "words": sum(self.words),
+            "activeDays": len(activeDays),
+            "currentStreak": currentStreak,
+            "longestStreak": longestStreak,
+            "wordsPerDay": sum(self.words) / len(activeDays) if activeDays else 0.0,
+            "wordsPerMonth": sorted(monthWords.items()),
+            "hours": hours,
+            "weekdays": weekdays,
+        }
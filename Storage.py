@@ -0,0 +1,100 @@
+import contextlib
+import json
+import os
+import pathlib
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+    import msvcrt
+
+
+def AtomicWrite(path, data, backups=0):
+    # Write to a temp file, flush it to disk and rename it over the target,
+    # so a crash leaves either the old or the new file but never a truncated one
+    path = pathlib.Path(path)
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    tmpPath = path.with_name(path.name + ".tmp")
+    with open(tmpPath, 'wb') as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    ReplaceFile(tmpPath, path, backups)
+
+
+def ReplaceFile(srcPath, path, backups=0):
+    # Atomically move an already synced file over the target
+    path = pathlib.Path(path)
+    if backups > 0 and path.exists():
+        RotateBackups(path, backups)
+    os.replace(srcPath, path)
+    SyncDirectory(path.parent)
+
+
+def DumpJson(obj, path, backups=0):
+    AtomicWrite(path, json.dumps(obj), backups)
+
+
+def AppendLines(path, lines):
+    # Several queued records share a single write and fsync
+    with open(path, 'a') as f:
+        f.write("".join(line + "\n" for line in lines))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def RotateBackups(path, backups):
+    # jrn_x.json.bak1 is the newest backup, jrn_x.json.bak<backups> the oldest
+    for i in range(backups - 1, 0, -1):
+        older = path.with_name(f"{path.name}.bak{i}")
+        if older.exists():
+            os.replace(older, path.with_name(f"{path.name}.bak{i + 1}"))
+    newest = path.with_name(f"{path.name}.bak1")
+    if newest.exists():
+        newest.unlink()
+    # Hard link keeps the current file in place until the rename replaces it
+    try:
+        os.link(path, newest)
+    except OSError:
+        newest.write_bytes(path.read_bytes())
+
+
+def SyncDirectory(path):
+    # Persist the rename itself, directories can't be opened on Windows
+    try:
+        fd = os.open(path, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+@contextlib.contextmanager
+def LockFile(path):
+    # Exclusive advisory lock on the file for the duration of the block. Every call opens its own
+    # descriptor, so the lock excludes other threads of this process as well as other processes.
+    with open(path, 'a+b') as f:
+        if fcntl is not None:
+            fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+        else:
+            # Locks the first byte, LK_LOCK gives up after 10 seconds
+            f.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    pass
+        try:
+            yield
+        finally:
+            if fcntl is not None:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
@@ -0,0 +1,66 @@
+from collections import OrderedDict
+
+# Compiled stylesheets kept, so stepping a spinbox back and forth doesn't compile the same sheet again
+STYLESHEET_CACHE_SIZE = 16
+
+
+def CompileStyleSheet(settings):
+    # Stylesheet of the whole window tree for the given settings
+    return (
+f"QWidget{{background-color: {settings['COLOR_BG_PRIMARY']}; selection-background-color: {settings['COLOR_PRIMARY']}; selection-color: {settings['COLOR_BG_SECONDARY']};}}"
+f"QAbstractScrollArea{{background-color: {settings['COLOR_BG_SECONDARY']};}}"
+f"QPushButton{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.8)}px; font-family: {settings['FONT']}; font-weight: bold; color: {settings['COLOR_PRIMARY']}; background-color: {settings['COLOR_BG_BUTTON']};}}"
+f"QToolButton{{font-size: {int(settings['FONT_SIZE_PRIMARY']*0.6)}px; font-family: {settings['FONT']}; font-weight: bold; color: {settings['COLOR_PRIMARY']}; background-color: {settings['COLOR_BG_BUTTON']};}}"
+f"QLabel{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.8)}px; font-family: {settings['FONT']}; color: {settings['COLOR_PRIMARY']};}}"
+f"QLineEdit{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.8)}px; font-family: {settings['FONT']}; min-width: 14em; color: {settings['COLOR_SECONDARY']}; background-color: {settings['COLOR_BG_BUTTON']};}}"
+f"QToolTip{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.75)}px; font-family: {settings['FONT']};}}"
+f"QListView{{font-size: {int(settings['FONT_SIZE_SECONDARY']*1.05)}px; font-family: {settings['FONT']}; color: {settings['COLOR_PRIMARY']};}}"
+f"QListView::item:selected{{background-color: {settings['COLOR_PRIMARY']};}}"
+f"QTextEdit{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.9)}px; font-family: {settings['FONT']}; color: {settings['COLOR_SECONDARY']};}}"
+f"TimelineView{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.9)}px; font-family: {settings['FONT']}; color: {settings['COLOR_SECONDARY']};}}"
+f"QScrollBar{{background-color: {settings['COLOR_PRIMARY']};}}"
+f"QComboBox{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.65)}px; color: {settings['COLOR_SECONDARY']};}}"
+f"QComboBox QAbstractScrollArea{{background-color: {settings['COLOR_SECONDARY']};}}"
+f"QSpinBox{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.65)}px; color: {settings['COLOR_SECONDARY']};}}"
+)
+
+
+def TitleStyleSheet(size):
+    return f"font-size: {size}px; font-weight: bold; font-style: italic;"
+
+
+def SwatchStyleSheet(color):
+    return f"background-color: {color};"
+
+
+class Theme:
+    # Applies settings to the window tree. Compiled stylesheets are cached by the settings they were
+    # compiled from, and setStyleSheet (which re-polishes every widget below) is only called when the
+    # compiled sheet differs from the one already applied.
+    def __init__(self):
+        self.cache = OrderedDict()
+        self.applied = {}
+        self.styleSheet = None
+
+    def StyleSheet(self, settings):
+        key = tuple(sorted(settings.items()))
+        styleSheet = self.cache.get(key)
+        if styleSheet is None:
+            styleSheet = self.cache[key] = CompileStyleSheet(settings)
+            if len(self.cache) > STYLESHEET_CACHE_SIZE:
+                self.cache.popitem(last=False)
+        else:
+            self.cache.move_to_end(key)
+        return styleSheet
+
+    def Apply(self, widget, settings):
+        # Returns the names of the settings that changed since the last call, empty if nothing was applied
+        changed = {name for name, value in settings.items() if self.applied.get(name) != value}
+        if not changed:
+            return changed
+        self.applied = dict(settings)
+        styleSheet = self.StyleSheet(settings)
+        if styleSheet != self.styleSheet:
+            self.styleSheet = styleSheet
+            widget.setStyleSheet(styleSheet)
+        return changed
@@ -0,0 +1,119 @@
+from PyQt5 import QtWidgets, QtGui, QtCore
+from collections import OrderedDict
+
+# Number of rendered day documents kept and recycled by a timeline
+DOCUMENT_POOL_SIZE = 24
+# Space (px) around and between the days
+MARGIN = 12
+SPACING = 24
+# Pixels scrolled per arrow key press
+LINE_STEP = 40
+
+
+class TimelineView(QtWidgets.QAbstractScrollArea):
+    # Continuous, virtualized view of consecutive days. Only the days intersecting the viewport
+    # are laid out and painted, from a small pool of recycled QTextDocuments, so memory and paint
+    # time don't depend on the number of days. The position is the top day plus a pixel offset
+    # into it. Days are fetched on demand through the source callables.
+    topDayChanged = QtCore.pyqtSignal(int)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.dayCount = lambda: 0
+        self.dayTitle = None
+        self.dayHtml = None
+        self.placeholder = ""
+        self.topDay = 0
+        self.offset = 0
+        self.documents = OrderedDict()
+        self.setVerticalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.setHorizontalScrollBarPolicy(QtCore.Qt.ScrollBarAlwaysOff)
+        self.setFocusPolicy(QtCore.Qt.StrongFocus)
+
+    def SetSource(self, dayCount, dayTitle, dayHtml):
+        self.dayCount = dayCount
+        self.dayTitle = dayTitle
+        self.dayHtml = dayHtml
+        self.Invalidate()
+
+    def Invalidate(self, day=None):
+        # Drop rendered days (all of them by default) so they are fetched again
+        if day is None:
+            self.documents.clear()
+        else:
+            self.documents.pop(day, None)
+        self.viewport().update()
+
+    def Document(self, day):
+        doc = self.documents.pop(day, None)
+        if doc is None:
+            # Reuse the least recently shown document once the pool is full
+            if len(self.documents) >= DOCUMENT_POOL_SIZE:
+                doc = self.documents.popitem(last=False)[1]
+            else:
+                doc = QtGui.QTextDocument(self)
+            doc.setDefaultFont(self.font())
+            doc.setHtml(f"<h3>{self.dayTitle(day)}</h3>{self.dayHtml(day) or self.placeholder}")
+        self.documents[day] = doc
+        doc.setTextWidth(max(1, self.viewport().width() - 2 * MARGIN))
+        return doc
+
+    def DayHeight(self, day):
+        return self.Document(day).size().height() + SPACING
+
+    def ScrollToDay(self, day):
+        self.topDay = max(0, min(day, self.dayCount() - 1))
+        self.offset = 0
+        self.viewport().update()
+
+    def ScrollBy(self, dy):
+        count = self.dayCount()
+        if count == 0:
+            return
+        topDay = self.topDay
+        self.offset += dy
+        while self.offset < 0 and self.topDay > 0:
+            self.topDay -= 1
+            self.offset += self.DayHeight(self.topDay)
+        while self.topDay < count - 1 and self.offset >= self.DayHeight(self.topDay):
+            self.offset -= self.DayHeight(self.topDay)
+            self.topDay += 1
+        # Don't scroll past the end of the last day
+        if self.topDay == count - 1:
+            self.offset = min(self.offset, max(0, self.DayHeight(self.topDay) - self.viewport().height()))
+        self.offset = max(0, self.offset)
+        self.viewport().update()
+        if self.topDay != topDay:
+            self.topDayChanged.emit(self.topDay)
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self.viewport())
+        context = QtGui.QAbstractTextDocumentLayout.PaintContext()
+        context.palette = self.palette()
+        context.palette.setColor(QtGui.QPalette.Text, self.palette().color(QtGui.QPalette.WindowText))
+        y = MARGIN - self.offset
+        day = self.topDay
+        count = self.dayCount()
+        while day < count and y < self.viewport().height():
+            doc = self.Document(day)
+            painter.save()
+            painter.translate(MARGIN, y)
+            doc.documentLayout().draw(painter, context)
+            painter.restore()
+            y += doc.size().height() + SPACING
+            day += 1
+
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self.viewport().update()
+
+    def wheelEvent(self, event):
+        self.ScrollBy(-event.angleDelta().y() // 2)
+
+    def keyPressEvent(self, event):
+        steps = {QtCore.Qt.Key_Up: -LINE_STEP, QtCore.Qt.Key_Down: LINE_STEP,
+                 QtCore.Qt.Key_PageUp: -self.viewport().height(), QtCore.Qt.Key_PageDown: self.viewport().height()}
+        if event.key() in steps:
+            self.ScrollBy(steps[event.key()])
+        else:
+            super().keyPressEvent(event)
@@ -0,0 +1,56 @@
+# Compares the JSON and SQLite journal backends on synthetic journals of 1k, 10k and 100k days.
+#   python benchmarks/bench_backends.py --days 1000 10000 100000
+import argparse
+import datetime as dt
+import os
+import pathlib
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+import Backends
+from Journal import Journal
+from synthetic import WriteJournal
+from timing import Timed, Median
+
+
+def BenchBackend(backend, sampleDates, repeat):
+    results = {}
+    results["load"], jrn = Timed(Journal, "bench", backend)
+    now = dt.datetime(2000, 1, 1, 16, 0)
+    results["add"] = Median(lambda: (jrn.AddEntry("new entry", now), jrn.Flush()), repeat)
+    results["edit"] = Median(lambda: (jrn.EditEntry(jrn.DayEntries()[-1].id, f"edited {random.random()}"),
+                                      jrn.Flush()), repeat)
+    results["read"] = Median(lambda: [jrn.GetEntries(date, "#ffffff", "read", random.random())
+                                      for date in sampleDates], repeat) / len(sampleDates)
+    jrn.Close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--entries-per-day", type=int, default=2)
+    parser.add_argument("--entry-size", type=int, default=300)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'days':>8} {'backend':>8} {'load':>10} {'add':>10} {'edit':>10} {'read/day':>10}  (ms)")
+    for days in args.days:
+        with tempfile.TemporaryDirectory() as tmpDir:
+            os.chdir(tmpDir)
+            dates = WriteJournal("bench", days, args.entries_per_day, args.entry_size)
+            # Let the one-time index creation and the import happen outside the timings
+            Backends.JsonBackend("bench").Load()
+            Backends.ImportJson("bench").Close()
+            sampleDates = random.sample(dates, min(200, days))
+            for backend in ("json", "sqlite"):
+                r = BenchBackend(backend, sampleDates, args.repeat)
+                print(f"{days:>8} {backend:>8} {r['load']:>10.2f} {r['add']:>10.2f} {r['edit']:>10.2f} "
+                      f"{r['read']:>10.3f}")
+            os.chdir(pathlib.Path(tmpDir).parent)
+
+
+if __name__ == "__main__":
+    main()
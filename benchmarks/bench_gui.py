@@ -0,0 +1,199 @@
+# Scripts the journals and main windows under the offscreen platform against a large synthetic journal and
+# records the latency of every interaction and the event loop stalls around it. With --budget-ms it fails
+# when an interaction or a stall takes longer than a frame, so frame budgets can be enforced without a display.
+#   python benchmarks/bench_gui.py --days 10000 --lines 3 --budget-ms 16.7
+import argparse
+import os
+import pathlib
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from PyQt5 import QtWidgets, QtCore
+import Backends
+from main import JournalsWindow, SLIDE_COALESCE_MS
+from synthetic import WriteJournal
+from timing import PERCENTILES, Stats
+
+# Scenarios that wait for background work, their latency is end to end and not the time the GUI was blocked
+ASYNC_SCENARIOS = ("update list", "open journal")
+
+
+class Recorder(QtCore.QObject):
+    # Runs the script one step per timer tick, so the event loop runs between interactions like it does
+    # between real input events. A zero-interval heartbeat measures how long the loop was blocked.
+    def __init__(self, script, interval):
+        super().__init__()
+        self.latencies = {}
+        self.stalls = {}
+        self.scenario = None
+        self.script = script(self)
+        self.lastBeat = time.perf_counter()
+        self.heartbeat = QtCore.QTimer(self)
+        self.heartbeat.timeout.connect(self.Beat)
+        self.stepTimer = QtCore.QTimer(self)
+        self.stepTimer.setInterval(interval)
+        self.stepTimer.timeout.connect(self.Step)
+
+    def Start(self):
+        self.heartbeat.start(0)
+        self.stepTimer.start()
+
+    def Beat(self):
+        now = time.perf_counter()
+        if self.scenario is not None:
+            self.stalls.setdefault(self.scenario, []).append((now - self.lastBeat) * 1000)
+        self.lastBeat = now
+
+    def Step(self):
+        try:
+            next(self.script)
+        except StopIteration:
+            self.heartbeat.stop()
+            self.stepTimer.stop()
+            QtWidgets.QApplication.quit()
+
+    def Scenario(self, name):
+        self.scenario = name
+        self.lastBeat = time.perf_counter()
+
+    def Timed(self, window, func, *args):
+        # Latency of an interaction, up to the repaint it causes
+        start = time.perf_counter()
+        func(*args)
+        window.stackedWidget.repaint()
+        self.latencies.setdefault(self.scenario, []).append((time.perf_counter() - start) * 1000)
+
+    def Add(self, ms):
+        self.latencies.setdefault(self.scenario, []).append(ms)
+
+
+def BackgroundDone():
+    return QtCore.QThreadPool.globalInstance().activeThreadCount() == 0
+
+
+def Script(window, dates, args):
+    rng = random.Random(args.seed)
+
+    def Run(rec):
+        rec.Scenario("update list")
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            window.UpdateJournalList()
+            while not BackgroundDone():
+                yield
+            # One more iteration delivers the result to the GUI thread
+            yield
+            rec.Add((time.perf_counter() - start) * 1000)
+
+        rec.Scenario("open journal")
+        start = time.perf_counter()
+        window.OpenJournal("bench")
+        m = window.mainWindow
+        while m.jrn is None:
+            yield
+        rec.Add((time.perf_counter() - start) * 1000)
+
+        rec.Scenario("read/add")
+        for _ in range(args.repeat):
+            rec.Timed(window, m.ButtonRead)
+            yield
+            rec.Timed(window, m.ButtonAdd)
+            yield
+        m.ButtonRead()
+        yield
+
+        rec.Scenario("slider")
+        for _ in range(args.events):
+            rec.Timed(window, m.sbar_entry.setValue, rng.randrange(len(m.keys)))
+            yield
+
+        rec.Scenario("slider drag")
+        m.sbar_entry.setSliderDown(True)
+        position = m.sbar_entry.value()
+        for _ in range(args.events):
+            position = max(0, min(len(m.keys) - 1, position + rng.randint(-50, 50)))
+            rec.Timed(window, m.sbar_entry.setSliderPosition, position)
+            yield
+        m.sbar_entry.setSliderDown(False)
+        # Let the coalesced render of the last position happen inside the scenario
+        for _ in range(max(1, SLIDE_COALESCE_MS // args.interval + 2)):
+            yield
+
+        rec.Scenario("date change")
+        first, last = dates[0], dates[-1]
+        for _ in range(args.events):
+            day = rng.randint(first, last)
+            rec.Timed(window, m.dateEdit.setDate, m.DayToQDate(day))
+            yield
+
+        rec.Scenario("scroll")
+        for _ in range(args.events):
+            rec.Timed(window, m.timeline.ScrollBy, rng.randint(-400, 400))
+            yield
+        rec.Scenario(None)
+
+    return Run
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=10000)
+    parser.add_argument("--entries-per-day", type=int, default=2)
+    parser.add_argument("--entry-size", type=int, default=300)
+    parser.add_argument("--lines", type=int, default=3)
+    parser.add_argument("--journals", type=int, default=10, help="journals in the journal list")
+    parser.add_argument("--repeat", type=int, default=5, help="runs of the list update and the mode switches")
+    parser.add_argument("--events", type=int, default=100, help="events of every input scenario")
+    parser.add_argument("--interval", type=int, default=16, help="ms between scripted events")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--budget-ms", type=float, help="fail if an interaction or a stall exceeds this")
+    args = parser.parse_args()
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmpDir:
+        os.chdir(tmpDir)
+        try:
+            dates = WriteJournal("bench", args.days, args.entries_per_day, args.entry_size, args.lines, args.seed)
+            for i in range(args.journals - 1):
+                shutil.copyfile(Backends.JOURNALS_PATH / "jrn_bench.json", Backends.JOURNALS_PATH / f"jrn_bench{i}.json")
+            # One-time index creation outside the timings
+            Backends.JsonBackend("bench").Load()
+
+            app = QtWidgets.QApplication(sys.argv[:1])
+            window = JournalsWindow()
+            window.stackedWidget.resize(1024, 720)
+            recorder = Recorder(Script(window, dates, args), args.interval)
+            recorder.Start()
+            app.exec_()
+            window.mainWindow.CloseJournal()
+            Backends.ioExecutor.submit(lambda: None).result()
+        finally:
+            os.chdir(cwd)
+
+    print(f"{args.days} days, {args.entries_per_day} entries per day on {args.lines} line(s), "
+          f"{args.journals} journal(s), {QtWidgets.QApplication.platformName()} platform")
+    print(f"{'scenario':>13} {'n':>5} " + " ".join(f"{f'p{p}':>9}" for p in PERCENTILES)
+          + f" {'max':>9} {'stall':>9}  (ms)")
+    failures = []
+    for scenario, times in recorder.latencies.items():
+        stats = Stats(times)
+        stall = max(recorder.stalls.get(scenario, [0.0]))
+        print(f"{scenario:>13} {stats['n']:>5} " + " ".join(f"{stats[f'p{p}']:>9.2f}" for p in PERCENTILES)
+              + f" {stats['max']:>9.2f} {stall:>9.2f}")
+        if args.budget_ms is not None:
+            if scenario not in ASYNC_SCENARIOS and stats["p99"] > args.budget_ms:
+                failures.append(f"{scenario} p99 {stats['p99']:.1f} ms")
+            if stall > args.budget_ms:
+                failures.append(f"{scenario} stall {stall:.1f} ms")
+    if failures:
+        print(f"FAIL: over the {args.budget_ms} ms frame budget: {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
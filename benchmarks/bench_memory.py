@@ -0,0 +1,48 @@
+# Compares the memory held by a fully loaded journal in the legacy layout (date strings -> lists of
+# [markup, "4:00 PM"] pairs, as json.load returned it before the compact entries), in the current stored
+# form (lists of {"id", "text", "minute"} objects) and in the compact in-memory form (day ordinals ->
+# tuples of Entry records) on a synthetic 100k-entry journal.
+#   python benchmarks/bench_memory.py --entries 100000 --entries-per-day 2
+import argparse
+import json
+import pathlib
+import sys
+import tracemalloc
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from Entries import DayOrdinal, FromStored
+from synthetic import MakeJournal, MakeLegacyJournal
+
+
+def Measure(build):
+    tracemalloc.start()
+    result = build()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size, result
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--entries", type=int, default=100000)
+    parser.add_argument("--entries-per-day", type=int, default=2)
+    parser.add_argument("--entry-size", type=int, default=300)
+    parser.add_argument("--lines", type=int, default=3)
+    args = parser.parse_args()
+
+    # JSON text of the journal as it was written before and as it is written now
+    journal = (args.entries // args.entries_per_day, args.entries_per_day, args.entry_size, args.lines)
+    legacyData = json.dumps(MakeLegacyJournal(*journal))
+    data = json.dumps(MakeJournal(*journal))
+    legacySize, legacy = Measure(lambda: json.loads(legacyData))
+    storedSize, _ = Measure(lambda: json.loads(data))
+    compactSize, _ = Measure(lambda: {DayOrdinal(date): FromStored(entries)
+                                      for date, entries in json.loads(legacyData).items()})
+    print(f"{args.entries} entries on {len(legacy)} days")
+    print(f"{'legacy':>10} {legacySize / 2 ** 20:>10.1f} MB")
+    for label, size in (("stored", storedSize), ("compact", compactSize)):
+        print(f"{label:>10} {size / 2 ** 20:>10.1f} MB  ({1 - size / legacySize:.0%} less)")
+
+
+if __name__ == "__main__":
+    main()
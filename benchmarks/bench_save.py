@@ -0,0 +1,53 @@
+# Compares a plain json.dump save against Storage.DumpJson (temp file, fsync, rename, backups)
+# on a synthetic multi-MB journal and fails if the durability overhead exceeds the budget.
+#   python benchmarks/bench_save.py --days 3000 --budget-ms 50
+import argparse
+import json
+import pathlib
+import sys
+import tempfile
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+from Storage import DumpJson
+from synthetic import MakeJournal
+from timing import Median
+
+
+def PlainSave(jrnDict, path, backups):
+    with open(path, 'w') as f:
+        json.dump(jrnDict, f)
+
+
+def Measure(save, jrnDict, path, repeat, backups):
+    return Median(lambda: save(jrnDict, path, backups), repeat)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=3000)
+    parser.add_argument("--entries-per-day", type=int, default=2)
+    parser.add_argument("--entry-size", type=int, default=400)
+    parser.add_argument("--backups", type=int, default=2)
+    parser.add_argument("--repeat", type=int, default=7)
+    parser.add_argument("--budget-ms", type=float, default=50.0)
+    args = parser.parse_args()
+
+    jrnDict = MakeJournal(args.days, args.entries_per_day, args.entry_size)
+    with tempfile.TemporaryDirectory() as tmpDir:
+        path = pathlib.Path(tmpDir) / "jrn_bench.json"
+        plain = Measure(PlainSave, jrnDict, path, args.repeat, args.backups)
+        durable = Measure(DumpJson, jrnDict, path, args.repeat, args.backups)
+        size = path.stat().st_size / 1024 / 1024
+
+    overhead = durable - plain
+    print(f"journal size:   {size:.1f} MB")
+    print(f"plain save:     {plain:.1f} ms")
+    print(f"durable save:   {durable:.1f} ms")
+    print(f"overhead:       {overhead:.1f} ms (budget {args.budget_ms:.1f} ms)")
+    if overhead > args.budget_ms:
+        print("FAIL: durable save exceeds the per-save budget")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+# Benchmarks the journal storage layer on a synthetic journal: loading it, adding, editing and reading
+# entries, and scanning the journals directory for the journal list. Reports latency percentiles and
+# the peak RSS, runs can be saved as JSON baselines and later runs compared against them.
+#   python benchmarks/bench_storage.py --days 10000 --lines 3 --save baseline.json
+#   python benchmarks/bench_storage.py --days 10000 --lines 3 --compare baseline.json --tolerance 0.25
+import argparse
+import datetime as dt
+import json
+import os
+import pathlib
+import platform
+import random
+import shutil
+import sys
+import tempfile
+
+try:
+    import resource
+except ImportError:
+    # Not available on Windows, the peak RSS isn't reported there
+    resource = None
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+import Backends
+from Catalog import Catalog
+from Journal import Journal
+from synthetic import WriteJournal
+from timing import PERCENTILES, Timed, Stats
+
+# Differences of the median below this are noise, not regressions
+NOISE_MS = 0.05
+
+
+def PeakRss():
+    # Peak resident set size of the process in MB
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in bytes on macOS, in KB elsewhere
+    return peak / 2 ** 20 if sys.platform == "darwin" else peak / 2 ** 10
+
+
+def BenchJournal(backend, dates, args, rng):
+    times = {"load": [], "add": [], "edit": [], "read": [], "read cached": []}
+    for _ in range(args.repeat):
+        ms, jrn = Timed(Journal, "bench", backend)
+        times["load"].append(ms)
+        jrn.Close()
+
+    jrn = Journal("bench", backend)
+    # Writes are timed until they reached the disk
+    now = dt.datetime.combine(dt.date.today(), dt.time(16, 0))
+    for i in range(args.ops):
+        times["add"].append(Timed(lambda: (jrn.AddEntry(f"new entry {i}\nsecond line", now), jrn.Flush()))[0])
+    entryIds = [entry.id for entry in jrn.DayEntries()]
+    for i in range(args.ops):
+        entryId = rng.choice(entryIds)
+        times["edit"].append(Timed(lambda: (jrn.EditEntry(entryId, f"edited {i}\nsecond line"), jrn.Flush()))[0])
+    for i in range(args.ops):
+        date = rng.choice(dates)
+        # A settings version of its own for every read, so the day is rendered
+        times["read"].append(Timed(jrn.GetEntries, date, "#ffc800", "read", -i - 1)[0])
+        times["read cached"].append(Timed(jrn.GetEntries, date, "#ffc800", "read", -i - 1)[0])
+    jrn.Close()
+    return {operation: Stats(opTimes) for operation, opTimes in times.items()}
+
+
+def BenchScan(repeat):
+    # What JournalsWindow.GetJournals does: without a catalog every journal is read, with one only stat'ed
+    times = {"scan cold": [], "scan warm": []}
+    for _ in range(repeat):
+        Backends.JOURNALS_PATH.joinpath("catalog.json").unlink(missing_ok=True)
+        times["scan cold"].append(Timed(lambda: Catalog().Scan())[0])
+        # Wait until the catalog is written
+        Backends.ioExecutor.submit(lambda: None).result()
+        times["scan warm"].append(Timed(lambda: Catalog().Scan())[0])
+    return {operation: Stats(opTimes) for operation, opTimes in times.items()}
+
+
+def Compare(results, baseline, tolerance):
+    # Prints the medians next to the baseline's, returns the operations that got slower than the tolerance
+    print(f"\n{'group':>8} {'operation':>12} {'baseline':>10} {'now':>10} {'change':>8}  (p50, ms)")
+    regressions = []
+    for group, operations in results.items():
+        for operation, stats in operations.items():
+            base = baseline.get(group, {}).get(operation)
+            if base is None:
+                continue
+            change = stats["p50"] / base["p50"] - 1 if base["p50"] else 0.0
+            print(f"{group:>8} {operation:>12} {base['p50']:>10.3f} {stats['p50']:>10.3f} {change:>+8.0%}")
+            if change > tolerance and stats["p50"] - base["p50"] > NOISE_MS:
+                regressions.append(f"{group} {operation}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=10000)
+    parser.add_argument("--entries-per-day", type=int, default=2)
+    parser.add_argument("--entry-size", type=int, default=300)
+    parser.add_argument("--lines", type=int, default=3, help="lines of every entry")
+    parser.add_argument("--journals", type=int, default=10, help="journals in the directory for the scan")
+    parser.add_argument("--backends", nargs="+", default=["json", "sqlite"], choices=sorted(Backends.BACKENDS))
+    parser.add_argument("--repeat", type=int, default=5, help="runs of the load and the scan")
+    parser.add_argument("--ops", type=int, default=200, help="runs of every entry operation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--save", type=pathlib.Path, help="write the results to this baseline")
+    parser.add_argument("--compare", type=pathlib.Path, help="compare the results with this baseline")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown of a median")
+    args = parser.parse_args()
+    config = {name: getattr(args, name) for name in ("days", "entries_per_day", "entry_size", "lines",
+                                                     "journals", "repeat", "ops", "seed")}
+    baseline = None
+    if args.compare is not None:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline["config"] != config:
+            print(f"warning: the baseline was run with {baseline['config']}")
+
+    cwd = os.getcwd()
+    results = {}
+    with tempfile.TemporaryDirectory() as tmpDir:
+        os.chdir(tmpDir)
+        try:
+            dates = WriteJournal("bench", args.days, args.entries_per_day, args.entry_size, args.lines, args.seed)
+            for i in range(args.journals - 1):
+                shutil.copyfile(Backends.JOURNALS_PATH / "jrn_bench.json", Backends.JOURNALS_PATH / f"jrn_bench{i}.json")
+            results["catalog"] = BenchScan(args.repeat)
+            # Let the one-time index creation and the import happen outside the timings
+            Backends.JsonBackend("bench").Load()
+            if "sqlite" in args.backends:
+                Backends.ImportJson("bench").Close()
+            rng = random.Random(args.seed)
+            for backend in args.backends:
+                results[backend] = BenchJournal(backend, dates, args, rng)
+        finally:
+            os.chdir(cwd)
+    peakRss = PeakRss()
+
+    print(f"{args.days} days, {args.entries_per_day} entries per day of {args.entry_size} characters "
+          f"on {args.lines} line(s), {args.journals} journal(s)")
+    print(f"{'group':>8} {'operation':>12} {'n':>5} " + " ".join(f"{f'p{p}':>9}" for p in PERCENTILES) + f" {'max':>9}  (ms)")
+    for group, operations in results.items():
+        for operation, stats in operations.items():
+            print(f"{group:>8} {operation:>12} {stats['n']:>5} "
+                  + " ".join(f"{stats[f'p{p}']:>9.3f}" for p in PERCENTILES) + f" {stats['max']:>9.3f}")
+    if peakRss is not None:
+        print(f"peak RSS: {peakRss:.1f} MB")
+
+    if args.save is not None:
+        with open(args.save, 'w') as f:
+            json.dump({"config": config, "python": platform.python_version(), "platform": platform.platform(),
+                       "peakRssMb": peakRss, "results": results}, f, indent=2)
+        print(f"saved to {args.save}")
+    if baseline is not None:
+        regressions = Compare(results, baseline["results"], args.tolerance)
+        if baseline.get("peakRssMb") and peakRss is not None:
+            print(f"peak RSS: {baseline['peakRssMb']:.1f} MB -> {peakRss:.1f} MB")
+        if regressions:
+            print(f"FAIL: slower than the baseline by more than {args.tolerance:.0%}: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+# Synthetic journals for the benchmarks, written to ./Journals in the current format
+import datetime as dt
+import json
+import pathlib
+import random
+import sys
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+import Backends
+from Entries import Entry, ToStored, FromStored, Markup
+
+WORDS = ["lorem", "ipsum", "dolor", "sit", "amet", "consectetur", "adipiscing", "elit", "<b>", "&"]
+START_DATE = dt.date(2000, 1, 1)
+
+
+def MakeText(rng, entrySize, lines):
+    # About entrySize characters spread over the given number of lines, with characters that need escaping
+    wordsPerLine = max(1, entrySize // 6 // lines)
+    return "\n".join(" ".join(rng.choice(WORDS) for _ in range(wordsPerLine)) for _ in range(lines))
+
+
+def MakeJournal(days, entriesPerDay, entrySize, lines=1, seed=0):
+    # Stored form of a journal: ISO date -> entries, one day after the other from START_DATE
+    rng = random.Random(seed)
+    return {str(START_DATE + dt.timedelta(i)):
+            ToStored([Entry(j, MakeText(rng, entrySize, lines), rng.randrange(24 * 60)) for j in range(entriesPerDay)])
+            for i in range(days)}
+
+
+def MakeLegacyJournal(days, entriesPerDay, entrySize, lines=1, seed=0):
+    # The same journal in the first storage format: ISO date -> [markup, "4:00 PM"] pairs
+    return {date: [[Markup(entry.text), entry.Time()] for entry in FromStored(entries)]
+            for date, entries in MakeJournal(days, entriesPerDay, entrySize, lines, seed).items()}
+
+
+def WriteJournal(name, days, entriesPerDay, entrySize, lines=1, seed=0):
+    # Returns the journal's days as ordinals
+    jrnDict = MakeJournal(days, entriesPerDay, entrySize, lines, seed)
+    Backends.JOURNALS_PATH.mkdir(exist_ok=True)
+    with open(Backends.JOURNALS_PATH / f"jrn_{name}.json", 'w') as f:
+        json.dump(jrnDict, f)
+    return [dt.date.fromisoformat(date).toordinal() for date in jrnDict]
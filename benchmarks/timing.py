@@ -0,0 +1,24 @@
+# Timing helpers shared by the benchmarks, every time is in ms
+import statistics
+import time
+
+PERCENTILES = (50, 90, 99)
+
+
+def Timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return (time.perf_counter() - start) * 1000, result
+
+
+def Median(func, repeat):
+    return statistics.median(Timed(func)[0] for _ in range(repeat))
+
+
+def Stats(times):
+    # Nearest-rank percentiles of the timings
+    times = sorted(times)
+    stats = {f"p{p}": times[min(len(times) - 1, len(times) * p // 100)] for p in PERCENTILES}
+    stats["max"] = times[-1]
+    stats["n"] = len(times)
+    return stats
@@ -1,5 +1,15 @@
+import time
+# Start of the startup, before any other import, for --profile-startup
+STARTUP_TIME = time.perf_counter()
 from PyQt5 import QtWidgets, QtGui, QtCore
-from Journal import Journal
+# Modules only needed once a journal is opened or searched (Journal, Backends, Catalog, Search,
+# Timeline, Drafts) are imported where they are first used, so the journals window is shown without them
+from Storage import DumpJson
+from Theme import Theme, TitleStyleSheet, SwatchStyleSheet
+from Entries import OrdinalDate
+from Calendar import MonthIndex
+import Instrumentation
+from Instrumentation import Timed
 from random import randint
 import datetime as dt
 import pathlib
@@ -7,8 +17,8 @@ import json
 import os
 import sys
 
-# Default Settings
-settings = {
+SETTINGS_PATH = pathlib.Path("./Settings/settings.json")
+DEFAULT_SETTINGS = {
     "FONT": "Acme",
     "FONT_SIZE_PRIMARY": 52,
     "FONT_SIZE_SECONDARY": 30,
@@ -18,6 +28,145 @@ settings = {
     "COLOR_BG_SECONDARY": "#000000",
     "COLOR_BG_BUTTON": "#595959"
 }
+settings = dict(DEFAULT_SETTINGS)
+# Bumped whenever ApplySettings applies changed settings so cached renders of old settings aren't reused
+settingsVersion = 0
+# Delay (ms) after the last slider move while dragging before the entry is rendered
+SLIDE_COALESCE_MS = 30
+# Delay (ms) after the last keystroke before the draft is snapshotted and written to disk
+DRAFT_SAVE_MS = 500
+# Delay (ms) after the last font change before the window is restyled
+THEME_APPLY_MS = 150
+# Delay (ms) after the last settings change before the settings are written to disk
+SETTINGS_SAVE_MS = 1000
+# Delay (ms) after the last change of the journal files on disk before they are read again
+RELOAD_COALESCE_MS = 200
+# QDate's Julian day of a date minus its proleptic Gregorian ordinal, the day numbering of journals
+JULIAN_DAY_OFFSET = QtCore.QDate(1, 1, 1).toJulianDay() - 1
+
+
+class WorkerSignals(QtCore.QObject):
+    finished = QtCore.pyqtSignal(object)
+    failed = QtCore.pyqtSignal(str)
+
+
+class Worker(QtCore.QRunnable):
+    # Runs a blocking call on the global thread pool and reports back on the GUI thread
+    def __init__(self, func, *args):
+        super().__init__()
+        self.func = func
+        self.args = args
+        self.signals = WorkerSignals()
+
+    def run(self):
+        try:
+            result = self.func(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+
+
+# Loaded on first search, then kept up to date by the open journal
+searchIndex = None
+
+
+def LoadSearchIndex():
+    global searchIndex
+    if searchIndex is None:
+        from Search import SearchIndex
+        searchIndex = SearchIndex()
+    searchIndex.Refresh()
+    return searchIndex
+
+
+def IndexJournalDay(jrnName, date, entries, oldEntries):
+    if searchIndex is not None:
+        searchIndex.UpdateDay(jrnName, date, entries, oldEntries)
+
+
+# Statistics of the journals viewed this session, built on first view then kept up to date by the journal
+journalStats = {}
+
+
+def LoadStats(jrn):
+    from Stats import JournalStats
+    return JournalStats.FromJournal(jrn)
+
+
+def StatsJournalDay(jrnName, date, entries, oldEntries):
+    stats = journalStats.get(jrnName)
+    if stats is not None:
+        stats.SetDay(date, entries)
+
+
+# Metadata of every journal, loaded on the first scan of the journals directory
+catalog = None
+
+
+def ScanCatalog():
+    global catalog
+    if catalog is None:
+        from Catalog import Catalog
+        catalog = Catalog()
+    return catalog.Scan()
+
+
+def CatalogJournalDay(jrnName, date, entries, oldEntries):
+    if catalog is not None:
+        catalog.UpdateDay(jrnName, date, entries, oldEntries)
+
+
+def RunInBackground(func, *args, onFinished=None, onFailed=None):
+    worker = Worker(func, *args)
+    if onFinished is not None:
+        worker.signals.finished.connect(onFinished)
+    if onFailed is not None:
+        worker.signals.failed.connect(onFailed)
+    QtCore.QThreadPool.globalInstance().start(worker)
+    return worker
+
+
+class StartupProfiler(QtCore.QObject):
+    # Times the phases of the startup for --profile-startup. Every phase is measured from the end of
+    # the previous one, the report is printed and the app quits once the first frame was painted
+    # and the journal list was filled.
+    LAST_PHASES = ("first frame", "journal list")
+
+    def __init__(self):
+        super().__init__()
+        self.phases = {}
+        self.last = STARTUP_TIME
+
+    def Mark(self, phase):
+        if phase in self.phases:
+            return
+        now = time.perf_counter()
+        self.phases[phase] = now - self.last
+        self.last = now
+        if all(phase in self.phases for phase in self.LAST_PHASES):
+            self.Report()
+            QtWidgets.QApplication.quit()
+
+    def eventFilter(self, obj, event):
+        if event.type() == QtCore.QEvent.Paint:
+            obj.removeEventFilter(self)
+            self.Mark("first frame")
+        return False
+
+    def Report(self):
+        for phase, seconds in self.phases.items():
+            print(f"{phase:<14}{seconds * 1000:>9.1f} ms", file=sys.stderr)
+        print(f"{'total':<14}{sum(self.phases.values()) * 1000:>9.1f} ms", file=sys.stderr)
+
+
+# Set by --profile-startup
+startupProfiler = None
+
+
+def MarkStartup(phase):
+    if startupProfiler is not None:
+        startupProfiler.Mark(phase)
 
 class JournalsWindow(QtWidgets.QMainWindow):
     def __init__(self):
@@ -25,9 +174,31 @@ class JournalsWindow(QtWidgets.QMainWindow):
 
         self.mainWindow = None
         self.settingsWindow = None
+        self.allJournalsWindow = None
         self.selectedJName = ""
-        self.CreateSettings()
+        self.listRequest = 0
+        self.theme = Theme()
+        # Coalesces spinbox steps and font changes so the window is restyled once they settle
+        self.themeTimer = QtCore.QTimer(self)
+        self.themeTimer.setSingleShot(True)
+        self.themeTimer.setInterval(THEME_APPLY_MS)
+        self.themeTimer.timeout.connect(self.ApplySettings)
+        # Batches the writes of settings changed in quick succession
+        self.saveTimer = QtCore.QTimer(self)
+        self.saveTimer.setSingleShot(True)
+        self.saveTimer.setInterval(SETTINGS_SAVE_MS)
+        self.saveTimer.timeout.connect(self.SaveSettings)
+        # Quitting doesn't always go through OnClose, it is only installed once a journal is opened
+        QtWidgets.QApplication.instance().aboutToQuit.connect(self.FlushSettings)
+        # Journals written by other copies of the app are listed again once their files settle
+        self.listReloadTimer = QtCore.QTimer(self)
+        self.listReloadTimer.setSingleShot(True)
+        self.listReloadTimer.setInterval(RELOAD_COALESCE_MS)
+        self.listReloadTimer.timeout.connect(self.OnJournalFilesChange)
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.directoryChanged.connect(lambda path: self.listReloadTimer.start())
         self.LoadSettings()
+        MarkStartup("settings")
         self.InitUI()
 
     def InitUI(self):
@@ -59,17 +230,32 @@ class JournalsWindow(QtWidgets.QMainWindow):
         pbtn_settings.setToolTip(f"Go to settings ({pbtn_settings.shortcut().toString()})")
         pbtn_settings.clicked.connect(self.OpenSettings)
 
-        # Create list widget and fill journals in it
-        self.listWidget = QtWidgets.QListWidget()
-        self.UpdateJournalList()
-        self.listWidget.setCurrentRow(0)
-        self.listWidget.setMinimumSize(450, 200)
-        self.listWidget.setFrameShape(QtWidgets.QFrame.Box)
-        self.listWidget.setFrameShadow(QtWidgets.QFrame.Shadow.Plain)
-        self.listWidget.setLineWidth(5)
-        self.listWidget.setToolTip(f"Double-click on a journal to open it (Enter)")
-        self.listWidget.setCursor(QtCore.Qt.PointingHandCursor)
-        self.listWidget.itemDoubleClicked.connect(self.OnDoubleClick)
+        # Create the journal model, sorted by last modification and filtered by name
+        self.jrnModel = JournalListModel(self)
+        self.jrnProxy = QtCore.QSortFilterProxyModel(self)
+        self.jrnProxy.setSourceModel(self.jrnModel)
+        self.jrnProxy.setSortRole(JournalListModel.MTimeRole)
+        self.jrnProxy.setFilterCaseSensitivity(QtCore.Qt.CaseInsensitive)
+        self.jrnProxy.sort(0, QtCore.Qt.DescendingOrder)
+
+        # Line edit for filtering the journals
+        self.ledit_filter = QtWidgets.QLineEdit()
+        self.ledit_filter.setPlaceholderText("Filter journals...")
+        self.ledit_filter.setClearButtonEnabled(True)
+        self.ledit_filter.textChanged.connect(self.OnFilterChange)
+
+        # Create list view and fill journals in it
+        self.listView = QtWidgets.QListView()
+        self.listView.setModel(self.jrnProxy)
+        self.listView.setUniformItemSizes(True)
+        self.listView.setEditTriggers(QtWidgets.QAbstractItemView.NoEditTriggers)
+        self.listView.setMinimumSize(450, 200)
+        self.listView.setFrameShape(QtWidgets.QFrame.Box)
+        self.listView.setFrameShadow(QtWidgets.QFrame.Shadow.Plain)
+        self.listView.setLineWidth(5)
+        self.listView.setToolTip(f"Double-click on a journal to open it (Enter)")
+        self.listView.setCursor(QtCore.Qt.PointingHandCursor)
+        self.listView.doubleClicked.connect(self.OnDoubleClick)
 
         # 'New' button
         pbtn_new = QtWidgets.QPushButton("New")
@@ -79,6 +265,22 @@ class JournalsWindow(QtWidgets.QMainWindow):
         pbtn_new.setToolTip(f"Create a new journal ({pbtn_new.shortcut().toString()})")
         pbtn_new.clicked.connect(self.ButtonNew)
 
+        # 'Search' button
+        pbtn_search = QtWidgets.QPushButton("Search")
+        pbtn_search.setMinimumHeight(60)
+        pbtn_search.setCursor(QtCore.Qt.PointingHandCursor)
+        pbtn_search.setShortcut(QtGui.QKeySequence("CTRL+F"))
+        pbtn_search.setToolTip(f"Search the entries of every journal ({pbtn_search.shortcut().toString()})")
+        pbtn_search.clicked.connect(self.OpenSearch)
+
+        # 'All' button
+        pbtn_all = QtWidgets.QPushButton("All")
+        pbtn_all.setMinimumHeight(60)
+        pbtn_all.setCursor(QtCore.Qt.PointingHandCursor)
+        pbtn_all.setShortcut(QtGui.QKeySequence("CTRL+T"))
+        pbtn_all.setToolTip(f"Read the entries of every journal in one timeline ({pbtn_all.shortcut().toString()})")
+        pbtn_all.clicked.connect(self.OpenAllJournals)
+
         # 'Delete' button
         pbtn_delete = QtWidgets.QPushButton("Delete")
         pbtn_delete.setMinimumHeight(60)
@@ -95,12 +297,15 @@ class JournalsWindow(QtWidgets.QMainWindow):
         # hbox_buttons assignment
         hbox_buttons.addWidget(pbtn_new)
         hbox_buttons.addStrut(1)
+        hbox_buttons.addWidget(pbtn_search)
+        hbox_buttons.addWidget(pbtn_all)
         hbox_buttons.addWidget(pbtn_delete)
         hbox_buttons.setSpacing(20)
 
         # vbox_main assignment
         vbox_main.addLayout(hbox_title)
-        vbox_main.addWidget(self.listWidget)
+        vbox_main.addWidget(self.ledit_filter)
+        vbox_main.addWidget(self.listView)
         vbox_main.addLayout(hbox_buttons)
         vbox_main.setContentsMargins(30, 30, 30, 10)
 
@@ -108,33 +313,78 @@ class JournalsWindow(QtWidgets.QMainWindow):
         widget_main.setLayout(vbox_main)
         self.setCentralWidget(widget_main)
 
-        self.ApplySettings()
-        self.stackedWidget.show()
+        if Instrumentation.ENABLED:
+            # Hidden shortcut for writing the instrumentation report
+            shortcut_report = QtWidgets.QShortcut(QtGui.QKeySequence("CTRL+SHIFT+F12"), self.stackedWidget)
+            shortcut_report.activated.connect(self.DumpInstrumentation)
 
+        MarkStartup("widgets")
+        self.ApplySettings(save=False)
+        MarkStartup("stylesheet")
+        if startupProfiler is not None:
+            self.stackedWidget.installEventFilter(startupProfiler)
+        self.stackedWidget.show()
+        MarkStartup("show")
+        # Scan the journals once the first frame is on screen
+        QtCore.QTimer.singleShot(0, self.UpdateJournalList)
+
+    def DumpInstrumentation(self):
+        Instrumentation.registry.Dump()
+        report = Instrumentation.registry.TextReport()
+        print(report, file=sys.stderr)
+        msg = QtWidgets.QMessageBox(self)
+        msg.setWindowTitle("Instrumentation")
+        msg.setText(f"Report written to {Instrumentation.REPORT_PATH}")
+        msg.setDetailedText(report)
+        msg.setStandardButtons(QtWidgets.QMessageBox.Ok)
+        msg.exec_()
+
+    @Timed("JournalsWindow.GetJournals")
     def GetJournals(self):
-        path = pathlib.Path(r"./Journals")
-        jrnPaths = sorted(path.iterdir(), key=os.path.getmtime, reverse=True)
-        journals = [(p.name[4:-5], self.PrettyTimeStamp(os.path.getmtime(p)),
-                     self.PrettyTimeStamp(os.path.getctime(p))) for p in jrnPaths]
-        return journals
+        return ScanCatalog()
 
     def UpdateJournalList(self):
-        self.listWidget.clear()
-        journals = self.GetJournals()
-        for jrnName, mTime, cTime in journals:
-            lWidget = QtWidgets.QListWidgetItem(jrnName.title(), self.listWidget)
-            lWidget.setToolTip(f"""Journal: {jrnName.title()}
-Last Modified: {mTime:>21}
-Created Date: {cTime:>22}""")
-            if jrnName == self.selectedJName:
-                self.listWidget.setCurrentItem(lWidget)
-        if self.listWidget.currentItem() is None:
-            self.listWidget.setCurrentRow(0)
+        # Scan the journals off the GUI thread, only the latest request fills the list
+        self.listRequest += 1
+        request = self.listRequest
+        RunInBackground(self.GetJournals, onFinished=lambda records: self.FillJournalList(records, request))
+
+    def FillJournalList(self, records, request):
+        if request != self.listRequest:
+            return
+        self.jrnModel.SetJournals(records)
+        self.SelectJournal(self.selectedJName)
+        self.WatchJournals()
+        MarkStartup("journal list")
+
+    def WatchJournals(self):
+        # Journals created, removed or rewritten by another process change the directory, the files of the
+        # open journal are watched by its window
+        from Backends import JOURNALS_PATH
+        if str(JOURNALS_PATH) not in self.watcher.directories() and JOURNALS_PATH.exists():
+            self.watcher.addPath(str(JOURNALS_PATH))
+
+    def OnJournalFilesChange(self):
+        # The catalog only reads the journals whose files changed. Other windows refresh the list
+        # when they return to this one.
+        if self.stackedWidget.currentWidget() is self:
+            self.UpdateJournalList()
+
+    def SelectJournal(self, jrnName):
+        index = self.jrnProxy.mapFromSource(self.jrnModel.IndexOf(jrnName))
+        if not index.isValid():
+            index = self.jrnProxy.index(0, 0)
+        self.listView.setCurrentIndex(index)
+
+    def OnFilterChange(self, text):
+        self.jrnProxy.setFilterFixedString(text)
+        if not self.listView.currentIndex().isValid():
+            self.listView.setCurrentIndex(self.jrnProxy.index(0, 0))
 
     def GetSelectedName(self):
-        current = self.listWidget.currentItem()
-        if current is not None:
-            return current.text().lower()
+        current = self.listView.currentIndex()
+        if current.isValid():
+            return current.data(QtCore.Qt.UserRole)
 
     def OnDoubleClick(self):
         jName = self.GetSelectedName()
@@ -168,7 +418,6 @@ Created Date: {cTime:>22}""")
     def ButtonDelete(self):
         jName = self.GetSelectedName()
         if jName is not None:
-            path = pathlib.Path(rf"./Journals/jrn_{jName}.json")
             # Create confirmation dialog
             dlg = QtWidgets.QMessageBox(self)
             dlg.setWindowTitle("Deleting Journal")
@@ -179,7 +428,12 @@ Created Date: {cTime:>22}""")
             answer = dlg.exec_()
             # Delete the journal if the answer is yes
             if answer == QtWidgets.QMessageBox.Yes:
-                path.unlink()
+                from Backends import JournalFiles
+                from Drafts import DraftPath
+                for path in JournalFiles(jName):
+                    path.unlink(missing_ok=True)
+                DraftPath(jName).unlink(missing_ok=True)
+                journalStats.pop(jName, None)
                 self.UpdateJournalList()
 
     def MainWindowToJournalslWindow(self):
@@ -192,7 +446,8 @@ Created Date: {cTime:>22}""")
                 self.stackedWidget.removeWidget(currentWidget)
                 self.stackedWidget.setCurrentIndex(0)
                 self.UpdateJournalList()
-                self.mainWindow.draftEditText = self.mainWindow.entriesOfToday
+                self.mainWindow.draftEditText = self.mainWindow.originalEditText
+                self.mainWindow.CloseJournal()
         else:
             isUnsubmitted = self.mainWindow.CheckUnsubmittedEntry()
             if isUnsubmitted == QtWidgets.QMessageBox.Yes or isUnsubmitted is None:
@@ -201,6 +456,8 @@ Created Date: {cTime:>22}""")
                 self.stackedWidget.setCurrentIndex(0)
                 self.UpdateJournalList()
                 self.mainWindow.draftText = ""
+                self.mainWindow.draftWriter.Discard()
+                self.mainWindow.CloseJournal()
             else:
                 if self.mainWindow.mode == "read":
                     self.mainWindow.ButtonAdd()
@@ -214,7 +471,33 @@ Created Date: {cTime:>22}""")
         self.stackedWidget.closeEvent = self.OnClose
         self.mainWindow.tedit_entry.setFocus()
 
+    def OpenSearch(self):
+        dlg = SearchDialog(self)
+        dlg.resultActivated.connect(self.OpenSearchResult)
+        dlg.exec_()
+
+    def OpenSearchResult(self, jrnName, date):
+        self.OpenJournal(jrnName)
+        self.mainWindow.JumpToDate(date)
+
+    def AllJournalsWindowToJournalsWindow(self):
+        currentWidget = self.stackedWidget.currentWidget()
+        self.stackedWidget.removeWidget(currentWidget)
+        self.stackedWidget.setCurrentIndex(0)
+        self.allJournalsWindow.CloseJournals()
+        self.UpdateJournalList()
+
+    def OpenAllJournals(self):
+        self.selectedJName = self.GetSelectedName()
+        self.allJournalsWindow = AllJournalsWindow()
+        self.allJournalsWindow.tbtn_toJournalsWindow.clicked.connect(self.AllJournalsWindowToJournalsWindow)
+        self.stackedWidget.addWidget(self.allJournalsWindow)
+        self.stackedWidget.setCurrentIndex(1)
+        self.allJournalsWindow.timeline.setFocus()
+
     def SettingsWindowToJournalsWindow(self):
+        if self.themeTimer.isActive():
+            self.ApplySettings()
         currentWidget = self.stackedWidget.currentWidget()
         self.stackedWidget.removeWidget(currentWidget)
         self.stackedWidget.setCurrentIndex(0)
@@ -248,7 +531,7 @@ Created Date: {cTime:>22}""")
         return dateTime.strftime('%Y/%m/%d  %H:%M:%S')
 
     def OnClose(self, event):
-        self.SaveSettings()
+        self.FlushSettings()
         if self.mainWindow.mode == "edit":
             # Check unsaved changes
             isUnsaved = self.mainWindow.CheckUnsubmittedEdit()
@@ -260,6 +543,7 @@ Created Date: {cTime:>22}""")
             # Check unsubmitted entry
             isUnsubmitted = self.mainWindow.CheckUnsubmittedEntry()
             if isUnsubmitted == QtWidgets.QMessageBox.Yes or isUnsubmitted is None:
+                self.mainWindow.draftWriter.Discard()
                 event.accept()
             else:
                 if self.mainWindow.mode == "read":
@@ -268,88 +552,71 @@ Created Date: {cTime:>22}""")
                 else:
                     event.ignore()
 
-    def CreateSettings(self):
-        path = pathlib.Path("./Settings")
-        settingsPath = pathlib.Path("./Settings/settings.json")
-        defaultSettingsPath = pathlib.Path("./Settings/defaultSettings.json")
-        if path.exists():
-            if not settingsPath.exists():
-                with open(settingsPath, 'w') as f:
-                    json.dump(settings, f)
-        else:
-            path.mkdir()
-            with open(settingsPath, 'w') as f:
-                json.dump(settings, f)
-
-        with open(defaultSettingsPath, 'w') as f:
-            json.dump(settings, f)
-
-
     def LoadSettings(self):
+        # Settings are only written when they don't exist yet, or later when they are changed
         global settings
-        path = pathlib.Path("./Settings/settings.json")
-        with open(path) as f:
-            settings = json.load(f)
+        try:
+            with open(SETTINGS_PATH) as f:
+                settings = json.load(f)
+        except FileNotFoundError:
+            settings = dict(DEFAULT_SETTINGS)
+            SETTINGS_PATH.parent.mkdir(exist_ok=True)
+            DumpJson(settings, SETTINGS_PATH)
 
     def SaveSettings(self):
-        path = pathlib.Path("./Settings/settings.json")
-        with open(path, 'w') as f:
-            json.dump(settings, f)
+        self.saveTimer.stop()
+        DumpJson(settings, SETTINGS_PATH)
+
+    def FlushSettings(self):
+        # Apply and write the settings still waiting on their timers
+        if self.themeTimer.isActive():
+            self.ApplySettings()
+        if self.saveTimer.isActive():
+            self.SaveSettings()
 
     def RestoreDefaultSettings(self):
         global settings
-        path = pathlib.Path("./Settings/defaultSettings.json")
-        with open(path) as f:
-            settings = json.load(f)
+        settings = dict(DEFAULT_SETTINGS)
         self.settingsWindow.UpdateFormSettings()
         self.ApplySettings()
 
-    def ApplySettings(self):
+    @Timed("JournalsWindow.ApplySettings")
+    def ApplySettings(self, save=True):
+        # Restyle only what the changed settings affect
+        global settingsVersion
+        self.themeTimer.stop()
+        changed = self.theme.Apply(self.stackedWidget, settings)
+        if not changed:
+            return
+        settingsVersion += 1
+        if "FONT_SIZE_PRIMARY" in changed:
+            self.lbl_title.setStyleSheet(TitleStyleSheet(int(settings['FONT_SIZE_PRIMARY'] * 1.2)))
         if self.settingsWindow is not None:
-            self.settingsWindow.lbl_settings.setStyleSheet(f"font-size: {settings['FONT_SIZE_PRIMARY']}px;\
-            font-weight: bold; font-style: italic;")
-            self.settingsWindow.pbtn_colorPrimary.setStyleSheet(f"background-color: {settings['COLOR_PRIMARY']};")
-            self.settingsWindow.pbtn_colorSecondary.setStyleSheet(f"background-color: {settings['COLOR_SECONDARY']};")
-            self.settingsWindow.pbtn_colorBgPrimary.setStyleSheet(f"background-color: {settings['COLOR_BG_PRIMARY']};")
-            self.settingsWindow.pbtn_colorBgSecondary.setStyleSheet(f"background-color: {settings['COLOR_BG_SECONDARY']};")
-            self.settingsWindow.pbtn_colorBgButton.setStyleSheet(f"background-color: {settings['COLOR_BG_BUTTON']};")
-
-        self.stackedWidget.setStyleSheet(
-f"QWidget{{background-color: {settings['COLOR_BG_PRIMARY']}; selection-background-color: {settings['COLOR_PRIMARY']}; selection-color: {settings['COLOR_BG_SECONDARY']};}}"
-f"QAbstractScrollArea{{background-color: {settings['COLOR_BG_SECONDARY']};}}"
-f"QPushButton{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.8)}px; font-family: {settings['FONT']}; font-weight: bold; color: {settings['COLOR_PRIMARY']}; background-color: {settings['COLOR_BG_BUTTON']};}}"
-f"QToolButton{{font-size: {int(settings['FONT_SIZE_PRIMARY']*0.6)}px; font-family: {settings['FONT']}; font-weight: bold; color: {settings['COLOR_PRIMARY']}; background-color: {settings['COLOR_BG_BUTTON']};}}"
-f"QLabel{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.8)}px; font-family: {settings['FONT']}; color: {settings['COLOR_PRIMARY']};}}"
-f"QLineEdit{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.8)}px; font-family: {settings['FONT']}; min-width: 14em; color: {settings['COLOR_SECONDARY']}; background-color: {settings['COLOR_BG_BUTTON']};}}"
-f"QToolTip{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.75)}px; font-family: {settings['FONT']};}}"
-f"QListWidget{{font-size: {int(settings['FONT_SIZE_SECONDARY']*1.05)}px; font-family: {settings['FONT']}; color: {settings['COLOR_PRIMARY']};}}"
-f"QListWidget::item:selected{{background-color: {settings['COLOR_PRIMARY']};}}"    
-f"QTextEdit{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.9)}px; font-family: {settings['FONT']}; color: {settings['COLOR_SECONDARY']};}}"
-f"QScrollBar{{background-color: {settings['COLOR_PRIMARY']};}}"
-f"QComboBox{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.65)}px; color: {settings['COLOR_SECONDARY']};}}"
-f"QComboBox QAbstractScrollArea{{background-color: {settings['COLOR_SECONDARY']};}}"
-f"QSpinBox{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.65)}px; color: {settings['COLOR_SECONDARY']};}}"
-)
-        self.lbl_title.setStyleSheet(f"font-size: {int(settings['FONT_SIZE_PRIMARY'] * 1.2)}px; font-weight: bold; font-style: italic;")
-        self.SaveSettings()
+            if "FONT_SIZE_PRIMARY" in changed:
+                self.settingsWindow.lbl_settings.setStyleSheet(TitleStyleSheet(settings['FONT_SIZE_PRIMARY']))
+            for name, button in self.settingsWindow.Swatches():
+                if name in changed:
+                    button.setStyleSheet(SwatchStyleSheet(settings[name]))
+        if save:
+            self.saveTimer.start()
 
     def OnFontChange(self):
         global settings
         font = self.settingsWindow.cmbox_font.currentFont().toString().split(',')[0]
         settings["FONT"] = font
-        self.ApplySettings()
+        self.themeTimer.start()
 
     def OnFontSizePrimaryChange(self):
         global settings
         size = self.settingsWindow.spbox_fontSizePrimary.value()
         settings["FONT_SIZE_PRIMARY"] = size
-        self.ApplySettings()
+        self.themeTimer.start()
 
     def OnFontSizeSecondaryChange(self):
         global settings
         size = self.settingsWindow.spbox_fontSizeSecondary.value()
         settings["FONT_SIZE_SECONDARY"] = size
-        self.ApplySettings()
+        self.themeTimer.start()
 
     def OnColorPrimaryChange(self):
         global settings
@@ -417,20 +684,191 @@ f"QSpinBox{{font-size: {int(settings['FONT_SIZE_SECONDARY']*0.65)}px; color: {se
         self.ApplySettings()
 
 
+class JournalListModel(QtCore.QAbstractListModel):
+    # Journals backed by their catalog records, tooltips are only built when Qt asks for them
+    MTimeRole = QtCore.Qt.UserRole + 1
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.names = []
+        self.rows = {}
+        self.records = {}
+
+    def rowCount(self, parent=QtCore.QModelIndex()):
+        return 0 if parent.isValid() else len(self.names)
+
+    def data(self, index, role=QtCore.Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        jrnName = self.names[index.row()]
+        if role == QtCore.Qt.DisplayRole:
+            return jrnName.title()
+        if role == QtCore.Qt.UserRole:
+            return jrnName
+        if role == self.MTimeRole:
+            return self.records[jrnName]["mtime"]
+        if role == QtCore.Qt.ToolTipRole:
+            record = self.records[jrnName]
+            return f"""Journal: {jrnName.title()}
+Last Modified: {JournalsWindow.PrettyTimeStamp(record["mtime"]):>21}
+Created Date: {JournalsWindow.PrettyTimeStamp(record["ctime"]):>22}
+Entries: {record["entries"]} on {record["days"]} day(s)"""
+        return None
+
+    def IndexOf(self, jrnName):
+        row = self.rows.get(jrnName)
+        return QtCore.QModelIndex() if row is None else self.index(row)
+
+    def SetJournals(self, records):
+        # Apply only the differences, so views and the proxy keep their state
+        removed = [self.rows[jrnName] for jrnName in self.names if jrnName not in records]
+        for row in sorted(removed, reverse=True):
+            self.beginRemoveRows(QtCore.QModelIndex(), row, row)
+            del self.names[row]
+            self.endRemoveRows()
+        if removed:
+            self.rows = {jrnName: row for row, jrnName in enumerate(self.names)}
+        for jrnName in self.names:
+            if records[jrnName] != self.records[jrnName]:
+                self.records[jrnName] = records[jrnName]
+                index = self.index(self.rows[jrnName])
+                self.dataChanged.emit(index, index)
+        added = [jrnName for jrnName in records if jrnName not in self.rows]
+        if added:
+            self.beginInsertRows(QtCore.QModelIndex(), len(self.names), len(self.names) + len(added) - 1)
+            for jrnName in added:
+                self.rows[jrnName] = len(self.names)
+                self.names.append(jrnName)
+                self.records[jrnName] = records[jrnName]
+            self.endInsertRows()
+        for jrnName in [jrnName for jrnName in self.records if jrnName not in self.rows]:
+            del self.records[jrnName]
+
+
 class MainWindow(QtWidgets.QMainWindow):
     def __init__(self, jrnName):
         super().__init__()
 
-        self.jrn = Journal(jrnName)
-        self.keys = list(self.jrn.jrnDict.keys())
+        self.jrnName = jrnName.strip().lower()
+        self.jrn = None
+        self.keys = []
         self.draftText = ""
-        self.entriesOfToday = self.jrn.GetEntries(self.jrn.date, settings['COLOR_PRIMARY'], "edit")
-        self.draftEditText = self.entriesOfToday
+        # Entry of today being edited, with its text before and after the changes
+        self.editEntryId = None
+        self.originalEditText = ""
+        self.draftEditText = self.originalEditText
         self.mode = "add"
-        self.lastValidDate = self.jrn.date
+        self.lastValidDate = dt.date.today().toordinal()
         self.lastReadDate = None
+        self.pendingJumpDate = None
+        self.monthIndex = None
+        from Drafts import DraftWriter
+        self.draftWriter = DraftWriter(self.jrnName)
 
         self.InitUI()
+        self.RestoreDraft()
+        # Load the journal off the GUI thread, the user can start typing meanwhile
+        self.SetLoading(True)
+        from Journal import Journal
+        RunInBackground(Journal, jrnName, onFinished=self.OnJournalLoaded, onFailed=self.OnJournalLoadFailed)
+
+    def OnJournalLoaded(self, jrn):
+        self.jrn = jrn
+        self.keys = self.jrn.dates
+        self.lastValidDate = self.jrn.date
+        # Set the date and slider ranges now that the dates are known
+        self.dateEdit.blockSignals(True)
+        self.dateEdit.setDate(self.DayToQDate(self.jrn.date))
+        self.dateEdit.setDateRange(self.DayToQDate(self.keys[0]), self.DayToQDate(self.keys[-1]))
+        self.dateEdit.blockSignals(False)
+        self.sbar_entry.blockSignals(True)
+        self.sbar_entry.setRange(0, len(self.keys) - 1)
+        self.RandomizeSliderPos()
+        self.sbar_entry.blockSignals(False)
+        self.SetLoading(False)
+        self.jrn.listeners.append(IndexJournalDay)
+        self.jrn.listeners.append(CatalogJournalDay)
+        self.jrn.listeners.append(StatsJournalDay)
+        # Days with entries are marked in the calendar popup, today only once it has an entry
+        self.monthIndex = MonthIndex(day for day in self.keys if day != self.jrn.date or self.jrn.DayEntries())
+        calendar = self.dateEdit.calendarWidget()
+        calendar.currentPageChanged.connect(self.MarkCalendarMonth)
+        self.MarkCalendarMonth(calendar.yearShown(), calendar.monthShown())
+        self.jrn.listeners.append(self.OnCalendarDayChange)
+        # Days written by other copies of the app are merged once the journal's files settle
+        self.reloadTimer = QtCore.QTimer(self)
+        self.reloadTimer.setSingleShot(True)
+        self.reloadTimer.setInterval(RELOAD_COALESCE_MS)
+        self.reloadTimer.timeout.connect(self.ReadJournalChanges)
+        self.watcher = QtCore.QFileSystemWatcher(self)
+        self.watcher.fileChanged.connect(lambda path: self.reloadTimer.start())
+        self.watcher.directoryChanged.connect(lambda path: self.reloadTimer.start())
+        self.WatchJournalFiles()
+        if self.pendingJumpDate is not None:
+            self.JumpToDate(self.pendingJumpDate)
+
+    def OnJournalLoadFailed(self, error):
+        msg = QtWidgets.QMessageBox(self)
+        msg.setWindowTitle("Loading Failed")
+        msg.setText(f"Journal {self.jrnName.title()} couldn't be loaded:\n{error}")
+        msg.setStandardButtons(QtWidgets.QMessageBox.Ok)
+        msg.setIconPixmap(QtGui.QPixmap("./images/warning.png"))
+        msg.exec_()
+
+    def CloseJournal(self):
+        if self.jrn is not None:
+            self.reloadTimer.stop()
+            paths = self.watcher.files() + self.watcher.directories()
+            if paths:
+                self.watcher.removePaths(paths)
+            self.jrn.Close()
+
+    def WatchJournalFiles(self):
+        # Files replaced by a rename are dropped from the watcher, they are added again after every change
+        from Backends import JOURNALS_PATH, WrittenFiles
+        watched = set(self.watcher.files()) | set(self.watcher.directories())
+        paths = [str(path) for path in WrittenFiles(self.jrnName)] + [str(JOURNALS_PATH)]
+        paths = [path for path in paths if path not in watched and os.path.exists(path)]
+        if paths:
+            self.watcher.addPaths(paths)
+
+    def ReadJournalChanges(self):
+        self.WatchJournalFiles()
+        RunInBackground(self.jrn.ReadChanges, onFinished=self.MergeJournalChanges)
+
+    def MergeJournalChanges(self, changes):
+        # Only the changed days are rendered again, unless new days moved the days after them.
+        # The ranges are compared with the widgets, as days may have been merged elsewhere already.
+        dates = self.jrn.MergeChanges(changes)
+        if not dates:
+            return
+        if self.sbar_entry.maximum() != len(self.keys) - 1:
+            self.dateEdit.blockSignals(True)
+            self.dateEdit.setDateRange(self.DayToQDate(self.keys[0]), self.DayToQDate(self.keys[-1]))
+            self.dateEdit.blockSignals(False)
+            self.sbar_entry.blockSignals(True)
+            self.sbar_entry.setRange(0, len(self.keys) - 1)
+            self.sbar_entry.blockSignals(False)
+            self.timeline.Invalidate()
+        else:
+            for date in dates:
+                self.timeline.Invalidate(self.jrn.DateIndex(date))
+        # The entries being edited changed in another window
+        if self.mode == "edit" and self.editEntryId is not None and self.jrn.date in dates:
+            try:
+                self.jrn.GetEntry(self.editEntryId)
+            except KeyError:
+                self.EditedEntryDeleted()
+                return
+            self.FillEntryBox(self.editEntryId)
+
+    def SetLoading(self, isLoading):
+        self.pbtn_submit.setEnabled(not isLoading)
+        self.pbtn_read.setEnabled(not isLoading)
+        if isLoading:
+            self.tedit_entry.setPlaceholderText("Loading the journal...")
+        else:
+            self.tedit_entry.setPlaceholderText("What happened today?")
 
     def InitUI(self):
         # Create layouts and central widget
@@ -440,7 +878,7 @@ class MainWindow(QtWidgets.QMainWindow):
         hbox_buttons = QtWidgets.QHBoxLayout()
 
         # Label for journal name
-        lbl_jName = QtWidgets.QLabel(self.jrn.name.title())
+        lbl_jName = QtWidgets.QLabel(self.jrnName.title())
         lbl_jName.setStyleSheet(f"font-size: {int(settings['FONT_SIZE_PRIMARY']*0.9)}px; font-weight: bold;\
         font-style: italic")
         lbl_jName.setMaximumWidth(600)
@@ -474,13 +912,23 @@ class MainWindow(QtWidgets.QMainWindow):
         self.dateEdit.setMinimumSize(200,30)
         self.dateEdit.setCalendarPopup(True)
         self.dateEdit.setCorrectionMode(1)  # 0: Previous value | 1: Nearest value
-        self.dateEdit.setDate(self.StrToQDate(self.jrn.date))
-        min, max = self.StrToQDate(self.keys[0]), self.StrToQDate(self.keys[-1])
-        self.dateEdit.setDateRange(min, max)
+        self.dateEdit.setDate(self.DayToQDate(self.lastValidDate))
         self.dateEdit.setEnabled(False)
         self.dateEdit.setCursor(QtCore.Qt.PointingHandCursor)
         self.dateEdit.dateChanged.connect(self.OnQDateChange)
 
+        # Shortcut for searching the journals
+        QtWidgets.QShortcut(QtGui.QKeySequence("CTRL+F"), self, self.OpenSearch)
+
+        # Tool button for the statistics of the journal
+        self.tbtn_stats = QtWidgets.QToolButton()
+        self.tbtn_stats.setText("Stats")
+        self.tbtn_stats.setMinimumHeight(40)
+        self.tbtn_stats.setCursor(QtCore.Qt.PointingHandCursor)
+        self.tbtn_stats.setShortcut(QtGui.QKeySequence("CTRL+I"))
+        self.tbtn_stats.setToolTip(f"Statistics of the journal ({self.tbtn_stats.shortcut().toString()})")
+        self.tbtn_stats.clicked.connect(self.OpenStats)
+
         # Textedit for adding entries
         self.tedit_entry = QtWidgets.QTextEdit()
         self.tedit_entry.setPlaceholderText("What happened today?")
@@ -489,6 +937,58 @@ class MainWindow(QtWidgets.QMainWindow):
         self.tedit_entry.setFrameShape(QtWidgets.QFrame.Box)
         self.tedit_entry.setLineWidth(2)
         self.tedit_entry.textChanged.connect(self.SaveDraft)
+        # Coalesces keystrokes so the draft is snapshotted once typing pauses
+        self.draftTimer = QtCore.QTimer(self)
+        self.draftTimer.setSingleShot(True)
+        self.draftTimer.setInterval(DRAFT_SAVE_MS)
+        self.draftTimer.timeout.connect(self.SnapshotDraft)
+
+        # Timeline for reading the entries of every day continuously
+        from Timeline import TimelineView
+        self.timeline = TimelineView()
+        self.timeline.setMinimumSize(360, 120)
+        self.timeline.setFrameShadow(QtWidgets.QFrame.Shadow.Plain)
+        self.timeline.setFrameShape(QtWidgets.QFrame.Box)
+        self.timeline.setLineWidth(2)
+        self.timeline.placeholder = "Blank... Click 'Add' to add the first entry of today."
+        self.timeline.SetSource(lambda: len(self.keys), lambda day: OrdinalDate(self.keys[day]),
+                                lambda day: self.jrn.GetEntries(self.keys[day], settings['COLOR_PRIMARY'], "read",
+                                                                settingsVersion))
+        self.timeline.topDayChanged.connect(self.OnTimelineScroll)
+
+        # Combobox for choosing the entry of today to edit, with buttons for reordering it
+        self.cmbox_entry = QtWidgets.QComboBox()
+        self.cmbox_entry.setMinimumHeight(30)
+        self.cmbox_entry.setCursor(QtCore.Qt.PointingHandCursor)
+        self.cmbox_entry.setToolTip("Entry of today to edit")
+        self.cmbox_entry.currentIndexChanged.connect(self.OnEntrySelect)
+        self.tbtn_entryUp = QtWidgets.QToolButton()
+        self.tbtn_entryUp.setArrowType(QtCore.Qt.UpArrow)
+        self.tbtn_entryUp.setMinimumHeight(30)
+        self.tbtn_entryUp.setShortcut(QtGui.QKeySequence("ALT+UP"))
+        self.tbtn_entryUp.setToolTip(f"Move the entry up ({self.tbtn_entryUp.shortcut().toString()})")
+        self.tbtn_entryUp.clicked.connect(lambda: self.MoveSelectedEntry(-1))
+        self.tbtn_entryDown = QtWidgets.QToolButton()
+        self.tbtn_entryDown.setArrowType(QtCore.Qt.DownArrow)
+        self.tbtn_entryDown.setMinimumHeight(30)
+        self.tbtn_entryDown.setShortcut(QtGui.QKeySequence("ALT+DOWN"))
+        self.tbtn_entryDown.setToolTip(f"Move the entry down ({self.tbtn_entryDown.shortcut().toString()})")
+        self.tbtn_entryDown.clicked.connect(lambda: self.MoveSelectedEntry(1))
+        # Row of the edit controls, only shown in edit mode
+        self.widget_edit = QtWidgets.QWidget()
+        hbox_edit = QtWidgets.QHBoxLayout()
+        hbox_edit.addWidget(self.cmbox_entry)
+        hbox_edit.addWidget(self.tbtn_entryUp)
+        hbox_edit.addWidget(self.tbtn_entryDown)
+        hbox_edit.setStretch(0, 1)
+        hbox_edit.setContentsMargins(0, 0, 0, 8)
+        self.widget_edit.setLayout(hbox_edit)
+        self.widget_edit.hide()
+
+        # Stacked widget showing the textedit when writing and the timeline when reading
+        self.stack_entry = QtWidgets.QStackedWidget()
+        self.stack_entry.addWidget(self.tedit_entry)
+        self.stack_entry.addWidget(self.timeline)
 
         # Pushbutton for submitting entries
         self.pbtn_submit = QtWidgets.QPushButton("Submit")
@@ -509,21 +1009,26 @@ class MainWindow(QtWidgets.QMainWindow):
         # Scrollbar for traversing the entriesW
         self.sbar_entry = QtWidgets.QScrollBar()
         self.sbar_entry.setOrientation(QtCore.Qt.Horizontal)
-        self.sbar_entry.setRange(0, len(self.keys) - 1)
         self.sbar_entry.setEnabled(False)
         self.sbar_entry.setMinimumHeight(30)
         self.sbar_entry.setFocusPolicy(QtCore.Qt.StrongFocus)
         self.sbar_entry.setInvertedControls(False)
         self.sbar_entry.setPageStep(7)
-        self.RandomizeSliderPos()
         self.sbar_entry.setCursor(QtCore.Qt.OpenHandCursor)
         self.sbar_entry.sliderPressed.connect(lambda: self.sbar_entry.setCursor(QtCore.Qt.ClosedHandCursor))
         self.sbar_entry.sliderReleased.connect(lambda: self.sbar_entry.setCursor(QtCore.Qt.OpenHandCursor))
-        self.sbar_entry.valueChanged.connect(self.SlideEntry)
+        self.sbar_entry.sliderReleased.connect(self.SlideEntry)
+        self.sbar_entry.valueChanged.connect(self.OnSliderValueChange)
+        # Coalesces slider moves during a drag so only the last position is rendered
+        self.slideTimer = QtCore.QTimer(self)
+        self.slideTimer.setSingleShot(True)
+        self.slideTimer.setInterval(SLIDE_COALESCE_MS)
+        self.slideTimer.timeout.connect(self.SlideEntry)
 
         # hbox_labels assignment
         hbox_labels.addWidget(lbl_jName)
         hbox_labels.addWidget(self.tbtn_toJournalsWindow)
+        hbox_labels.addWidget(self.tbtn_stats)
         hbox_labels.addStretch()
         hbox_labels.addWidget(self.dateEdit)
         # hbox_labels options
@@ -543,7 +1048,8 @@ class MainWindow(QtWidgets.QMainWindow):
         # vbox_main assignment
         vbox_main.addLayout(hbox_labels)
         vbox_main.addWidget(self.sbar_entry)
-        vbox_main.addWidget(self.tedit_entry)
+        vbox_main.addWidget(self.widget_edit)
+        vbox_main.addWidget(self.stack_entry)
         vbox_main.addLayout(hbox_buttons)
         # vbox_main options
         vbox_main.setSpacing(0)
@@ -553,26 +1059,33 @@ class MainWindow(QtWidgets.QMainWindow):
         widget_main.setLayout(vbox_main)
         self.setCentralWidget(widget_main)
 
+    @Timed("MainWindow.ButtonSubmit")
     def ButtonSubmit(self):
         # Get the text from textedit and add entry to journal
         entry = self.tedit_entry.toPlainText()
         self.tedit_entry.clear()
+        # The submitted entry is no longer a draft
+        self.FlushDraft()
         # Get time and add entry
-        time = dt.datetime.now().strftime("%#I:%M %p")
+        time = dt.datetime.now()
         self.jrn.AddEntry(entry, time)
-        self.entriesOfToday = self.jrn.GetEntries(self.jrn.date, settings['COLOR_PRIMARY'], "edit")
         self.tedit_entry.setFocus()
 
+    @Timed("MainWindow.ButtonEdit")
     def ButtonEdit(self):
-        # Change 'tedit_entry' properties
-        self.tedit_entry.setText(self.jrn.GetEntries(self.jrn.date, settings['COLOR_PRIMARY'], "edit"))
+        entries = self.jrn.DayEntries()
+        if not entries:
+            # Nothing to edit yet today, write the first entry instead
+            self.ButtonAdd()
+            return
+        # Change 'tedit_entry' properties, starting with the latest entry
+        self.ShowTimeline(False)
+        self.FillEntryBox(entries[-1].id)
+        self.LoadEntry(entries[-1].id)
+        self.widget_edit.show()
         # Toggle mode
         self.mode = "edit"
         self.tedit_entry.setReadOnly(False)
-        self.tedit_entry.setFocus()
-        cursor = self.tedit_entry.textCursor()
-        cursor.movePosition(QtGui.QTextCursor.End)
-        self.tedit_entry.setTextCursor(cursor)
         self.Reconnect(self.tedit_entry.textChanged, self.SaveEditDraft, self.SaveDraft)
         # Change 'sbar_entry' properties
         self.sbar_entry.setEnabled(False)
@@ -589,15 +1102,22 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pbtn_read.setToolTip(f"Discard the changes and revert to original entry ({self.pbtn_read.shortcut().toString()})")
         self.Reconnect(self.pbtn_read.clicked, self.ButtonRevertEdit, self.ButtonAdd)
 
+    @Timed("MainWindow.ButtonSaveEdit")
     def ButtonSaveEdit(self):
-        # Save changed entry
-        time = dt.datetime.now().strftime("%#I:%M %p")
-        self.jrn.EditEntry(self.draftEditText, time)
-        self.entriesOfToday = self.jrn.GetEntries(self.jrn.date, settings['COLOR_PRIMARY'], "edit")
+        self.FlushDraft()
+        # Save changed entry, only that entry is written
+        try:
+            self.jrn.EditEntry(self.editEntryId, self.draftEditText)
+        except KeyError:
+            self.EditedEntryDeleted()
+            return
+        self.editEntryId = None
+        self.widget_edit.hide()
         # Toggle mode
         self.mode = "read"
         # Change 'tedit_entry' properties
         self.tedit_entry.setReadOnly(True)
+        self.ShowTimeline(True)
         self.SlideEntry()
         self.Reconnect(self.tedit_entry.textChanged,self.SaveDraft, self.SaveEditDraft)
         # Change 'sbar_entry' properties
@@ -615,13 +1135,18 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pbtn_read.setToolTip(f"Add entry to the journal ({self.pbtn_read.shortcut().toString()})")
         self.Reconnect(self.pbtn_read.clicked, self.ButtonAdd, self.ButtonRevertEdit)
 
+    @Timed("MainWindow.ButtonRevertEdit")
     def ButtonRevertEdit(self):
         # Toggle mode
         self.mode = "read"
-        # Reset draftEditText
-        self.draftEditText = self.entriesOfToday
+        # Reset draftEditText, dropping a pending snapshot
+        self.draftTimer.stop()
+        self.draftEditText = self.originalEditText
+        self.editEntryId = None
+        self.widget_edit.hide()
         # Change 'tedit_entry' properties
         self.tedit_entry.setReadOnly(True)
+        self.ShowTimeline(True)
         self.SlideEntry()
         self.Reconnect(self.tedit_entry.textChanged, self.SaveDraft, self.SaveEditDraft)
         # Change 'sbar_entry' properties
@@ -639,15 +1164,76 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pbtn_read.setToolTip(f"Add entry to the journal ({self.pbtn_read.shortcut().toString()})")
         self.Reconnect(self.pbtn_read.clicked, self.ButtonAdd, self.ButtonRevertEdit)
 
+    def FillEntryBox(self, entryId):
+        # One item per entry of today, labelled with its time and first line
+        self.cmbox_entry.blockSignals(True)
+        self.cmbox_entry.clear()
+        for entry in self.jrn.DayEntries():
+            firstLine = entry.text.strip().split("\n", 1)[0]
+            self.cmbox_entry.addItem(f"{entry.Time()}  -  {firstLine[:60]}", entry.id)
+        self.cmbox_entry.setCurrentIndex(self.cmbox_entry.findData(entryId))
+        self.cmbox_entry.blockSignals(False)
+        self.tbtn_entryUp.setEnabled(self.cmbox_entry.currentIndex() > 0)
+        self.tbtn_entryDown.setEnabled(self.cmbox_entry.currentIndex() < self.cmbox_entry.count() - 1)
+
+    def LoadEntry(self, entryId):
+        # Show one entry of today for editing
+        self.editEntryId = entryId
+        self.originalEditText = self.jrn.GetEntry(entryId).text
+        self.draftEditText = self.originalEditText
+        self.tedit_entry.blockSignals(True)
+        self.tedit_entry.setPlainText(self.originalEditText)
+        self.tedit_entry.blockSignals(False)
+        self.tedit_entry.setFocus()
+        cursor = self.tedit_entry.textCursor()
+        cursor.movePosition(QtGui.QTextCursor.End)
+        self.tedit_entry.setTextCursor(cursor)
+
+    def OnEntrySelect(self, index):
+        entryId = self.cmbox_entry.itemData(index)
+        # Changes of the entry being edited are saved or discarded before switching
+        isUnsaved = self.CheckUnsubmittedEdit()
+        if isUnsaved == QtWidgets.QMessageBox.Yes or isUnsaved is None:
+            self.LoadEntry(entryId)
+            self.FillEntryBox(entryId)
+        else:
+            self.FillEntryBox(self.editEntryId)
+
+    def MoveSelectedEntry(self, step):
+        # Reordering is written right away, independently of the text being edited
+        position = self.cmbox_entry.currentIndex() + step
+        if 0 <= position < self.cmbox_entry.count():
+            try:
+                self.jrn.MoveEntry(self.editEntryId, position)
+            except KeyError:
+                self.EditedEntryDeleted()
+                return
+            self.FillEntryBox(self.editEntryId)
+
+    def EditedEntryDeleted(self):
+        # Another copy of the app deleted the entry being edited, its text can be kept as a new entry
+        self.FlushDraft()
+        self.editEntryId = None
+        dlg = QtWidgets.QMessageBox(self)
+        dlg.setWindowTitle("Entry Deleted")
+        dlg.setText("The entry being edited was deleted in another window. Add its text as a new entry?")
+        dlg.setStandardButtons(QtWidgets.QMessageBox.Yes | QtWidgets.QMessageBox.No)
+        dlg.setIconPixmap(QtGui.QPixmap("./images/warning.png"))
+        dlg.setDefaultButton(QtWidgets.QMessageBox.Yes)
+        if dlg.exec_() == QtWidgets.QMessageBox.Yes:
+            self.jrn.AddEntry(self.draftEditText, dt.datetime.now())
+        self.ButtonRevertEdit()
+
+    @Timed("MainWindow.ButtonRead")
     def ButtonRead(self):
+        self.FlushDraft()
         # Toggle read mode
         self.mode = "read"
-        # Change 'Textedit' properties
-        self.tedit_entry.setReadOnly(True)
-        self.tedit_entry.setPlaceholderText("Blank... Click 'Add' to add the first entry of today.")
+        # Show the timeline instead of the textedit
+        self.ShowTimeline(True)
         # Change QDateEdit properties
         self.dateEdit.setEnabled(True)
-        self.dateEdit.setDate(self.StrToQDate(self.lastReadDate))
+        self.dateEdit.setDate(self.DayToQDate(self.lastReadDate))
         # Change 'ScrollBar' properties
         self.sbar_entry.setEnabled(True)
         self.SlideEntry()
@@ -663,13 +1249,15 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pbtn_submit.setToolTip(f"Edit the entries of today ({self.pbtn_submit.shortcut().toString()})")
         self.Reconnect(self.pbtn_submit.clicked, self.ButtonEdit, self.ButtonSubmit)
 
+    @Timed("MainWindow.ButtonAdd")
     def ButtonAdd(self):
         # Change QDateEdit properties
-        self.lastReadDate = self.dateEdit.date().toString("yyyy-MM-dd")
-        self.dateEdit.setDate(self.StrToQDate(self.jrn.date))
+        self.lastReadDate = self.QDateToDay(self.dateEdit.date())
+        self.dateEdit.setDate(self.DayToQDate(self.jrn.date))
         self.dateEdit.setEnabled(False)
         # Change 'Textedit' properties
-        self.tedit_entry.setText(self.draftText)
+        self.ShowTimeline(False)
+        self.tedit_entry.setPlainText(self.draftText)
         self.tedit_entry.setReadOnly(False)
         self.tedit_entry.setPlaceholderText("What happened today?")
         self.tedit_entry.setFocus()
@@ -691,10 +1279,55 @@ class MainWindow(QtWidgets.QMainWindow):
         self.pbtn_submit.setToolTip(f"Submit entry to the journal ({self.pbtn_submit.shortcut().toString()})")
         self.Reconnect(self.pbtn_submit.clicked, self.ButtonSubmit, self.ButtonEdit)
 
+    def OnSliderValueChange(self):
+        if self.sbar_entry.isSliderDown():
+            self.slideTimer.start()
+        else:
+            self.SlideEntry()
+
     def SlideEntry(self):
+        self.slideTimer.stop()
         sPos = self.sbar_entry.sliderPosition()
         date = self.keys[sPos]
-        self.tedit_entry.setText(self.jrn.GetEntries(date, settings['COLOR_PRIMARY'], "read"))
+        self.timeline.ScrollToDay(sPos)
+        self.dateEdit.setDate(self.DayToQDate(date))
+
+    def OnTimelineScroll(self, day):
+        # Keep the slider and the date on the day at the top of the timeline
+        self.sbar_entry.blockSignals(True)
+        self.sbar_entry.setValue(day)
+        self.sbar_entry.blockSignals(False)
+        self.dateEdit.setDate(self.DayToQDate(self.keys[day]))
+
+    def ShowTimeline(self, isShown):
+        if isShown:
+            # Entries may have been added or edited while writing
+            self.timeline.Invalidate()
+            self.stack_entry.setCurrentWidget(self.timeline)
+        else:
+            self.stack_entry.setCurrentWidget(self.tedit_entry)
+
+    def OpenSearch(self):
+        dlg = SearchDialog(self, self.jrnName)
+        dlg.resultActivated.connect(lambda jrnName, date: self.JumpToDate(date))
+        dlg.exec_()
+
+    def OpenStats(self):
+        if self.jrn is None:
+            return
+        dlg = StatsDialog(self, self.jrn)
+        dlg.exec_()
+
+    def JumpToDate(self, date):
+        # Show the given day in read mode, once the journal is loaded
+        if self.jrn is None:
+            self.pendingJumpDate = date
+            return
+        self.pendingJumpDate = None
+        if self.mode == "edit":
+            return
+        if self.mode == "add":
+            self.ButtonRead()
         self.dateEdit.setDate(self.StrToQDate(date))
 
     def RandomizeSliderPos(self):
@@ -716,14 +1349,39 @@ class MainWindow(QtWidgets.QMainWindow):
             signal.connect(newHandler)
 
     def SaveDraft(self):
-        # If in add mode, save unsubmitted entry on value change
+        # If in add mode, save unsubmitted entry once typing pauses
+        if self.mode == "add":
+            self.draftTimer.start()
+
+    def SnapshotDraft(self):
+        self.draftTimer.stop()
+        draft = self.tedit_entry.toPlainText()
         if self.mode == "add":
-            draft = self.tedit_entry.toPlainText()
-            draft = draft.replace("<", "&lt;")
-            draft = draft.replace(">", "&gt;")
+            self.draftWriter.Save(draft)
             self.draftText = draft
+        elif self.mode == "edit":
+            self.draftEditText = draft
+
+    def FlushDraft(self):
+        # Take the pending snapshot now, before the draft is used or the mode changes
+        if self.draftTimer.isActive():
+            self.SnapshotDraft()
+
+    def RestoreDraft(self):
+        # Bring back the entry that wasn't submitted in the last session
+        from Drafts import ReadDraft
+        draft = ReadDraft(self.jrnName)
+        if draft:
+            self.draftText = draft
+            self.tedit_entry.blockSignals(True)
+            self.tedit_entry.setPlainText(self.draftText)
+            self.tedit_entry.blockSignals(False)
+            cursor = self.tedit_entry.textCursor()
+            cursor.movePosition(QtGui.QTextCursor.End)
+            self.tedit_entry.setTextCursor(cursor)
 
     def CheckUnsubmittedEntry(self):
+        self.FlushDraft()
         if self.draftText.split() != []:
             dlg = QtWidgets.QMessageBox(self)
             dlg.setWindowTitle("Closing Journal")
@@ -734,15 +1392,13 @@ class MainWindow(QtWidgets.QMainWindow):
             return dlg.exec_()
 
     def SaveEditDraft(self):
-        # If in edit mode, save unsaved edited entry on value change
+        # If in edit mode, save unsaved edited entry once typing pauses
         if self.mode == "edit":
-            draft = self.tedit_entry.toPlainText()
-            draft = draft.replace("<", "&lt;")
-            draft = draft.replace(">", "&gt;")
-            self.draftEditText = draft
+            self.draftTimer.start()
 
     def CheckUnsubmittedEdit(self):
-        if self.draftEditText.strip() != self.entriesOfToday.strip():
+        self.FlushDraft()
+        if self.draftEditText.strip() != self.originalEditText.strip():
             dlg = QtWidgets.QMessageBox(self)
             dlg.setWindowTitle("Closing Journal")
             dlg.setText(f"Changes aren't saved and will be lost. Proceed?")
@@ -755,31 +1411,337 @@ class MainWindow(QtWidgets.QMainWindow):
     def StrToQDate(timeString):
         return QtCore.QDate.fromString(timeString, "yyyy-MM-dd")
 
+    @staticmethod
+    def DayToQDate(day):
+        return QtCore.QDate.fromJulianDay(day + JULIAN_DAY_OFFSET)
+
+    @staticmethod
+    def QDateToDay(qDate):
+        return qDate.toJulianDay() - JULIAN_DAY_OFFSET
+
     def OnQDateChange(self):
-        date = self.dateEdit.date().toString("yyyy-MM-dd")
-        if date in self.keys:
-            self.lastValidDate = date
-        else:
+        date = self.QDateToDay(self.dateEdit.date())
+        index = self.jrn.DateIndex(date)
+        if index is None:
             date = self.GetNextValidDate(date)
-            self.lastValidDate = date
-        index = self.keys.index(date)
+            index = self.jrn.DateIndex(date)
+        self.lastValidDate = date
         self.sbar_entry.setSliderPosition(index)
         if date == self.jrn.date:
             self.pbtn_submit.setEnabled(True)
         else:
             self.pbtn_submit.setEnabled(False)
 
+    def MarkCalendarMonth(self, year, month):
+        # Days of the shown month with entries are bold, the empty ones dimmed
+        calendar = self.dateEdit.calendarWidget()
+        calendar.setDateTextFormat(QtCore.QDate(), QtGui.QTextCharFormat())
+        entryFormat = QtGui.QTextCharFormat()
+        entryFormat.setFontWeight(QtGui.QFont.Bold)
+        entryFormat.setForeground(QtGui.QColor(settings['COLOR_BG_SECONDARY']))
+        emptyFormat = QtGui.QTextCharFormat()
+        dimColor = QtGui.QColor(settings['COLOR_BG_PRIMARY'])
+        dimColor.setAlpha(100)
+        emptyFormat.setForeground(dimColor)
+        bits = self.monthIndex.Month(year, month)
+        for day in range(1, QtCore.QDate(year, month, 1).daysInMonth() + 1):
+            calendar.setDateTextFormat(QtCore.QDate(year, month, day), entryFormat if bits >> day - 1 & 1 else emptyFormat)
+
+    def OnCalendarDayChange(self, jrnName, date, entries, oldEntries):
+        # Journal listener
+        self.monthIndex.Set(date, bool(entries))
+        calendar = self.dateEdit.calendarWidget()
+        qDate = self.DayToQDate(date)
+        if (qDate.year(), qDate.month()) == (calendar.yearShown(), calendar.monthShown()):
+            self.MarkCalendarMonth(qDate.year(), qDate.month())
+
     def GetNextValidDate(self, date):
-        date = dt.datetime.strptime(date, "%Y-%m-%d")
-        isGreater = date > dt.datetime.strptime(self.lastValidDate, "%Y-%m-%d")
+        # Snap to the nearest date with entries in the direction the user is moving
+        isGreater = date > self.lastValidDate
         if isGreater:
-            while str(date)[:10] not in self.keys:
-                date += dt.timedelta(1)
-            return str(date)[:10]
+            return self.jrn.NextDate(date) or self.jrn.PreviousDate(date)
+        else:
+            return self.jrn.PreviousDate(date) or self.jrn.NextDate(date)
+
+
+class AllJournalsWindow(QtWidgets.QMainWindow):
+    # Read-only timeline of the entries of every journal, newest first
+    def __init__(self):
+        super().__init__()
+
+        self.merged = None
+        self.isClosed = False
+
+        self.InitUI()
+        # Only the date indexes of the journals are loaded, off the GUI thread
+        from Merged import MergedJournals
+        RunInBackground(MergedJournals, onFinished=self.OnJournalsLoaded, onFailed=self.OnJournalsLoadFailed)
+
+    def OnJournalsLoaded(self, merged):
+        if self.isClosed:
+            return
+        self.merged = merged
+        self.timeline.SetSource(lambda: merged.count, self.DayTitle,
+                                lambda day: merged.GetEntries(day, settings['COLOR_PRIMARY']))
+        self.sbar_days.setRange(0, max(0, merged.count - 1))
+        self.sbar_days.setEnabled(merged.count > 0)
+        self.lbl_status.setText(f"{merged.count} days in {len(merged.journals)} journals" if merged.count
+                                else "Blank... There are no entries yet.")
+
+    def OnJournalsLoadFailed(self, error):
+        self.lbl_status.setText("")
+        msg = QtWidgets.QMessageBox(self)
+        msg.setWindowTitle("Loading Failed")
+        msg.setText(f"The journals couldn't be loaded:\n{error}")
+        msg.setStandardButtons(QtWidgets.QMessageBox.Ok)
+        msg.setIconPixmap(QtGui.QPixmap("./images/warning.png"))
+        msg.exec_()
+
+    def CloseJournals(self):
+        self.isClosed = True
+
+    def InitUI(self):
+        # Create layouts and central widget
+        widget_main = QtWidgets.QWidget()
+        vbox_main = QtWidgets.QVBoxLayout()
+        hbox_labels = QtWidgets.QHBoxLayout()
+
+        # Label for the title
+        lbl_title = QtWidgets.QLabel("All Journals")
+        lbl_title.setStyleSheet(f"font-size: {int(settings['FONT_SIZE_PRIMARY']*0.9)}px; font-weight: bold;\
+        font-style: italic")
+
+        # Tool button for returning to Journals Window
+        self.tbtn_toJournalsWindow = QtWidgets.QToolButton()
+        self.tbtn_toJournalsWindow.setText("...")
+        self.tbtn_toJournalsWindow.setMinimumHeight(40)
+        self.tbtn_toJournalsWindow.setCursor(QtCore.Qt.PointingHandCursor)
+        self.tbtn_toJournalsWindow.setShortcut(QtGui.QKeySequence("ESC"))
+        self.tbtn_toJournalsWindow.setToolTip(f"Return to the journals window ({self.tbtn_toJournalsWindow.shortcut().toString()})")
+
+        # Label for the loading state and the size of the timeline
+        self.lbl_status = QtWidgets.QLabel("Loading the journals...")
+
+        # Scrollbar for traversing the days
+        self.sbar_days = QtWidgets.QScrollBar()
+        self.sbar_days.setOrientation(QtCore.Qt.Horizontal)
+        self.sbar_days.setEnabled(False)
+        self.sbar_days.setMinimumHeight(30)
+        self.sbar_days.setFocusPolicy(QtCore.Qt.StrongFocus)
+        self.sbar_days.setPageStep(7)
+        self.sbar_days.setCursor(QtCore.Qt.OpenHandCursor)
+        self.sbar_days.sliderPressed.connect(lambda: self.sbar_days.setCursor(QtCore.Qt.ClosedHandCursor))
+        self.sbar_days.sliderReleased.connect(lambda: self.sbar_days.setCursor(QtCore.Qt.OpenHandCursor))
+        self.sbar_days.valueChanged.connect(self.OnSliderValueChange)
+
+        # Timeline of the days of every journal
+        from Timeline import TimelineView
+        self.timeline = TimelineView()
+        self.timeline.setMinimumSize(360, 120)
+        self.timeline.setFrameShadow(QtWidgets.QFrame.Shadow.Plain)
+        self.timeline.setFrameShape(QtWidgets.QFrame.Box)
+        self.timeline.setLineWidth(2)
+        self.timeline.topDayChanged.connect(self.OnTimelineScroll)
+
+        # hbox_labels assignment
+        hbox_labels.addWidget(lbl_title)
+        hbox_labels.addWidget(self.tbtn_toJournalsWindow)
+        hbox_labels.addStretch()
+        hbox_labels.addWidget(self.lbl_status)
+        # hbox_labels options
+        hbox_labels.setContentsMargins(0, 0, 0, 20)
+        hbox_labels.setSpacing(10)
+
+        # vbox_main assignment
+        vbox_main.addLayout(hbox_labels)
+        vbox_main.addWidget(self.sbar_days)
+        vbox_main.addWidget(self.timeline)
+        # vbox_main options
+        vbox_main.setSpacing(0)
+        vbox_main.setContentsMargins(30, 20, 30, 30)
+
+        # Central widget assignment
+        widget_main.setLayout(vbox_main)
+        self.setCentralWidget(widget_main)
+
+    def DayTitle(self, day):
+        date, jrnName = self.merged.Key(day)
+        return f"{OrdinalDate(date)}  -  {jrnName.title()}"
+
+    def OnSliderValueChange(self, value):
+        self.timeline.ScrollToDay(value)
+
+    def OnTimelineScroll(self, day):
+        self.sbar_days.blockSignals(True)
+        self.sbar_days.setValue(day)
+        self.sbar_days.blockSignals(False)
+
+
+class SearchDialog(QtWidgets.QDialog):
+    resultActivated = QtCore.pyqtSignal(str, str)
+
+    def __init__(self, parent, currentJName=None):
+        super().__init__(parent)
+        # Results of other journals can only be opened from the journals window
+        self.currentJName = currentJName
+        self.index = None
+        self.InitUI()
+        RunInBackground(LoadSearchIndex, onFinished=self.OnIndexReady)
+
+    def InitUI(self):
+        self.setWindowTitle("Search")
+        self.setMinimumSize(600, 400)
+        vbox_main = QtWidgets.QVBoxLayout()
+
+        # Line edit for the query
+        self.ledit_query = QtWidgets.QLineEdit()
+        self.ledit_query.setPlaceholderText("Search all journals...")
+        self.ledit_query.setEnabled(False)
+        self.ledit_query.textChanged.connect(self.OnQueryChange)
+        self.ledit_query.returnPressed.connect(lambda: self.listWidget.currentItem() is not None and
+                                               self.OnResultActivate(self.listWidget.currentItem()))
+
+        # Label for the search status
+        self.lbl_status = QtWidgets.QLabel("Indexing journals...")
+
+        # List widget for the results
+        self.listWidget = QtWidgets.QListWidget()
+        self.listWidget.setCursor(QtCore.Qt.PointingHandCursor)
+        self.listWidget.setToolTip("Double-click on a result to read that day (Enter)")
+        self.listWidget.itemActivated.connect(self.OnResultActivate)
+
+        # vbox_main assignment
+        vbox_main.addWidget(self.ledit_query)
+        vbox_main.addWidget(self.lbl_status)
+        vbox_main.addWidget(self.listWidget)
+        self.setLayout(vbox_main)
+
+    def OnIndexReady(self, index):
+        self.index = index
+        self.lbl_status.setText("")
+        self.ledit_query.setEnabled(True)
+        self.ledit_query.setFocus()
+        self.OnQueryChange()
+
+    def OnQueryChange(self):
+        if self.index is None:
+            return
+        self.listWidget.clear()
+        results = self.index.Query(self.ledit_query.text())
+        for jrnName, date, score in results:
+            lWidget = QtWidgets.QListWidgetItem(f"{jrnName.title()}  -  {date}", self.listWidget)
+            lWidget.setData(QtCore.Qt.UserRole, (jrnName, date))
+            if self.currentJName is not None and jrnName != self.currentJName:
+                lWidget.setFlags(lWidget.flags() & ~QtCore.Qt.ItemIsEnabled)
+                lWidget.setToolTip("Open this journal from the journals window to read it")
+        if self.ledit_query.text().strip():
+            self.lbl_status.setText(f"{len(results)} result(s)")
         else:
-            while str(date)[:10] not in self.keys:
-                date -= dt.timedelta(1)
-            return str(date)[:10]
+            self.lbl_status.setText("")
+        self.listWidget.setCurrentRow(0)
+
+    def OnResultActivate(self, item):
+        if not item.flags() & QtCore.Qt.ItemIsEnabled:
+            return
+        jrnName, date = item.data(QtCore.Qt.UserRole)
+        self.accept()
+        self.resultActivated.emit(jrnName, date)
+
+
+class BarChart(QtWidgets.QWidget):
+    # Bars of values with a label under each one, in the colors of the settings
+    def __init__(self, title):
+        super().__init__()
+        self.title = title
+        self.labels = []
+        self.values = []
+        self.setMinimumHeight(150)
+
+    def SetData(self, labels, values):
+        self.labels = labels
+        self.values = values
+        self.update()
+
+    def paintEvent(self, event):
+        painter = QtGui.QPainter(self)
+        font = QtGui.QFont(settings['FONT'])
+        font.setPixelSize(max(8, int(settings['FONT_SIZE_SECONDARY'] * 0.5)))
+        painter.setFont(font)
+        lineHeight = painter.fontMetrics().height()
+        painter.setPen(QtGui.QColor(settings['COLOR_SECONDARY']))
+        peak = max(self.values, default=0)
+        painter.drawText(QtCore.QRectF(0, 0, self.width(), lineHeight), QtCore.Qt.AlignLeft,
+                         f"{self.title} (max {peak})")
+        if not self.values:
+            return
+        top = lineHeight + 4
+        bottom = self.height() - lineHeight
+        width = self.width() / len(self.values)
+        barColor = QtGui.QColor(settings['COLOR_PRIMARY'])
+        for i, (label, value) in enumerate(zip(self.labels, self.values)):
+            height = (bottom - top) * value / (peak or 1)
+            painter.fillRect(QtCore.QRectF(i * width + 1, bottom - height, max(1.0, width - 2), height), barColor)
+            painter.drawText(QtCore.QRectF(i * width, bottom, width, lineHeight), QtCore.Qt.AlignCenter, label)
+
+
+class StatsDialog(QtWidgets.QDialog):
+    # Statistics of one journal. They are built off the GUI thread the first time, later views
+    # reuse the ones kept up to date since.
+    WEEKDAYS = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+    # Months shown in the words per month chart
+    CHART_MONTHS = 12
+
+    def __init__(self, parent, jrn):
+        super().__init__(parent)
+        self.jrn = jrn
+        self.InitUI()
+        stats = journalStats.get(jrn.name)
+        if stats is not None:
+            self.FillStats(stats)
+        else:
+            RunInBackground(LoadStats, jrn, onFinished=self.OnStatsReady, onFailed=self.OnStatsFailed)
+
+    def InitUI(self):
+        self.setWindowTitle(f"Statistics - {self.jrn.name.title()}")
+        self.setMinimumSize(700, 600)
+        vbox_main = QtWidgets.QVBoxLayout()
+
+        # Label for the totals and streaks
+        self.lbl_summary = QtWidgets.QLabel("Counting entries...")
+
+        # Charts
+        self.chart_hours = BarChart("Entries by hour")
+        self.chart_weekdays = BarChart("Entries by weekday")
+        self.chart_months = BarChart("Words per month")
+
+        # vbox_main assignment
+        vbox_main.addWidget(self.lbl_summary)
+        vbox_main.addWidget(self.chart_hours)
+        vbox_main.addWidget(self.chart_weekdays)
+        vbox_main.addWidget(self.chart_months)
+        self.setLayout(vbox_main)
+
+    def OnStatsReady(self, stats):
+        # Entries of today may have changed while the stats were built
+        stats.SetDay(self.jrn.date, self.jrn.DayEntries())
+        journalStats[self.jrn.name] = stats
+        self.FillStats(stats)
+
+    def OnStatsFailed(self, error):
+        self.lbl_summary.setText(f"Statistics couldn't be computed:\n{error}")
+
+    def FillStats(self, stats):
+        summary = stats.Summary(dt.date.today().toordinal())
+        months = summary["wordsPerMonth"]
+        self.lbl_summary.setText(
+            f"{summary['entries']} entries, {summary['words']} words on {summary['activeDays']} day(s)\n"
+            f"Current streak: {summary['currentStreak']} day(s)    Longest streak: {summary['longestStreak']} day(s)\n"
+            f"Words per day: {summary['wordsPerDay']:.0f}    "
+            f"Words per month: {sum(words for _, words in months) / max(1, len(months)):.0f}")
+        self.chart_hours.SetData([str(hour) for hour in range(24)], summary["hours"])
+        self.chart_weekdays.SetData(list(self.WEEKDAYS), summary["weekdays"])
+        months = months[-self.CHART_MONTHS:]
+        self.chart_months.SetData([f"{month[5:]}/{month[2:4]}" for month, _ in months], [words for _, words in months])
 
 
 class SettingsWindow(QtWidgets.QMainWindow):
@@ -797,7 +1759,7 @@ class SettingsWindow(QtWidgets.QMainWindow):
 
         # Create title 'Settings'
         self.lbl_settings = QtWidgets.QLabel("Settings")
-        self.lbl_settings.setStyleSheet(f"font-size: {settings['FONT_SIZE_PRIMARY']}px; font-weight: bold; font-style: italic;")
+        self.lbl_settings.setStyleSheet(TitleStyleSheet(settings['FONT_SIZE_PRIMARY']))
 
         # Tool button for returning to Journals Window
         self.tbtn_toJournalsWindow = QtWidgets.QToolButton()
@@ -885,14 +1847,21 @@ class SettingsWindow(QtWidgets.QMainWindow):
         self.cmbox_font.setCurrentFont(QtGui.QFont(settings["FONT"]))
         self.spbox_fontSizePrimary.setValue(settings["FONT_SIZE_PRIMARY"])
         self.spbox_fontSizeSecondary.setValue(settings["FONT_SIZE_SECONDARY"])
-        self.pbtn_colorPrimary.setStyleSheet(f"background-color: {settings['COLOR_PRIMARY']};")
-        self.pbtn_colorSecondary.setStyleSheet(f"background-color: {settings['COLOR_SECONDARY']};")
-        self.pbtn_colorBgPrimary.setStyleSheet(f"background-color: {settings['COLOR_BG_PRIMARY']};")
-        self.pbtn_colorBgSecondary.setStyleSheet(f"background-color: {settings['COLOR_BG_SECONDARY']};")
-        self.pbtn_colorBgButton.setStyleSheet(f"background-color: {settings['COLOR_BG_BUTTON']};")
+        for name, button in self.Swatches():
+            button.setStyleSheet(SwatchStyleSheet(settings[name]))
+
+    def Swatches(self):
+        # Color settings and the buttons showing them
+        return (("COLOR_PRIMARY", self.pbtn_colorPrimary), ("COLOR_SECONDARY", self.pbtn_colorSecondary),
+                ("COLOR_BG_PRIMARY", self.pbtn_colorBgPrimary), ("COLOR_BG_SECONDARY", self.pbtn_colorBgSecondary),
+                ("COLOR_BG_BUTTON", self.pbtn_colorBgButton))
 
 
 if __name__ == "__main__":
+    if "--profile-startup" in sys.argv:
+        startupProfiler = StartupProfiler()
+    MarkStartup("imports")
     app = QtWidgets.QApplication(sys.argv)
+    MarkStartup("application")
     window = JournalsWindow()
     sys.exit(app.exec_())
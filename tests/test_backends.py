@@ -0,0 +1,136 @@
+import datetime as dt
+import json
+import os
+import pathlib
+import sys
+import tempfile
+import threading
+import unittest
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+import Backends
+from Journal import Journal
+
+NOW = dt.datetime(2026, 1, 1, 10, 0)
+
+
+class PendingAddTest(unittest.TestCase):
+    # Entries added and then changed before their record reached the log
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpDir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpDir.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmpDir.cleanup()
+
+    def Blocked(self):
+        # Holds the I/O thread until the returned event is set
+        release = threading.Event()
+        Backends.ioExecutor.submit(release.wait)
+        return release
+
+    def Texts(self, jrn):
+        return [(entry.id, entry.text) for entry in jrn.DayEntries()]
+
+    def testEditBeforeFlush(self):
+        for backend in Backends.BACKENDS:
+            with self.subTest(backend=backend):
+                jrn = Journal("pending", backend)
+                release = self.Blocked()
+                jrn.AddEntry("typo", NOW)
+                jrn.EditEntry(0, "fixed")
+                release.set()
+                jrn.Flush()
+                self.assertEqual(self.Texts(jrn), [(0, "fixed")])
+                jrn.Close()
+                jrn = Journal("pending", backend)
+                self.assertEqual(self.Texts(jrn), [(0, "fixed")])
+                jrn.Close()
+
+    def testEditOfTakenIdBeforeFlush(self):
+        # The other journal's add is written first, the edit follows the entry to its new id
+        for backend in Backends.BACKENDS:
+            with self.subTest(backend=backend):
+                first = Journal("taken", backend)
+                second = Journal("taken", backend)
+                release = self.Blocked()
+                first.AddEntry("from first", NOW)
+                second.AddEntry("typo", NOW)
+                second.EditEntry(0, "from second")
+                release.set()
+                second.Flush()
+                second.MergeChanges(second.ReadChanges())
+                self.assertEqual(self.Texts(second), [(0, "from first"), (1, "from second")])
+                first.Close()
+                second.Close()
+                jrn = Journal("taken", backend)
+                self.assertEqual(self.Texts(jrn), [(0, "from first"), (1, "from second")])
+                jrn.Close()
+
+
+class EmptyDayTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpDir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpDir.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmpDir.cleanup()
+
+    def Stored(self, name):
+        return json.loads((Backends.JOURNALS_PATH / f"jrn_{name}.json").read_text())
+
+    def testTodayNotSaved(self):
+        jrn = Journal("empty", "json")
+        jrn.Save()
+        self.assertEqual(self.Stored("empty"), {})
+        jrn.AddEntry("after the save", NOW)
+        self.assertEqual([entry.text for entry in jrn.DayEntries()], ["after the save"])
+        jrn.Close()
+
+    def testEmptiedByOtherProcess(self):
+        first = Journal("emptied", "json")
+        first.AddEntry("deleted", NOW)
+        first.Save()
+        second = Journal("emptied", "json")
+        first.DeleteEntry(0)
+        first.Save()
+        self.assertEqual(self.Stored("emptied"), {})
+        self.assertEqual(second.MergeChanges(second.ReadChanges()), [second.date])
+        self.assertEqual(second.DayEntries(), ())
+        first.Close()
+        second.Close()
+
+
+class ReaderTest(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.tmpDir = tempfile.TemporaryDirectory()
+        os.chdir(self.tmpDir.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.tmpDir.cleanup()
+
+    def testLegacyJournal(self):
+        # Journals written before the index are read without being migrated
+        Backends.JOURNALS_PATH.mkdir()
+        days = {"2020-01-02": [["<textarea>a \\\"quoted\\\" [text]</textarea>", "4:00 PM"]],
+                "2020-01-01": [["<textarea>{braces} ü</textarea>", "9:30 AM"], ["<textarea>b</textarea>", "9:31 AM"]],
+                "2020-01-03": []}
+        path = Backends.JOURNALS_PATH / "jrn_legacy.json"
+        path.write_text(json.dumps(days, indent=4, ensure_ascii=False), encoding="utf-8")
+        reader = Backends.OpenReader("legacy")
+        full = Backends.JsonBackend.ReadAll("legacy")
+        self.assertEqual(reader.dates, sorted(day for day, entries in full.items() if entries))
+        for day in full:
+            self.assertEqual([(entry.text, entry.minute) for entry in reader.ReadDay(day)],
+                             [(entry.text, entry.minute) for entry in full[day]])
+        self.assertFalse(path.with_suffix(".idx").exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
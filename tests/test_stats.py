@@ -0,0 +1,36 @@
+import pathlib
+import sys
+import unittest
+from unittest import mock
+
+sys.path.insert(0, str(pathlib.Path(__file__).resolve().parent.parent))
+import Stats
+from Entries import Entry
+
+TODAY = 738000
+
+
+class JournalStatsTest(unittest.TestCase):
+    def Build(self):
+        stats = Stats.JournalStats([TODAY - 3, TODAY - 2, TODAY - 2, TODAY], [540, 600, 1380, 61], [3, 5, 1, 2])
+        stats.SetDay(TODAY - 2, [Entry(0, "one two", 720)])
+        stats.SetDay(TODAY - 1, [Entry(0, "a b c", 30), Entry(1, "d", 31)])
+        stats.SetDay(TODAY - 3, [])
+        return stats
+
+    def testChangedDays(self):
+        summary = self.Build().Summary(TODAY)
+        self.assertEqual((summary["entries"], summary["words"], summary["activeDays"]), (4, 8, 3))
+        self.assertEqual((summary["currentStreak"], summary["longestStreak"]), (3, 3))
+        self.assertEqual(summary["hours"][:2], [2, 1])
+
+    @unittest.skipIf(Stats.np is None, "NumPy isn't installed")
+    def testWithoutNumpy(self):
+        summary = self.Build().Summary(TODAY + 5)
+        with mock.patch.object(Stats, "np", None):
+            plain = self.Build().Summary(TODAY + 5)
+        self.assertEqual(plain, summary)
+
+
+if __name__ == "__main__":
+    unittest.main()